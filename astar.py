@@ -1,75 +1,149 @@
 """
 Implementación del algoritmo A*
 """
-import time
-from priority_queue import PriorityQueue
+from priority_queue import get_queue_class
+from node_store import NodeStore
+from search_trace import SearchTrace
+from search_progress import SearchClock, make_snapshot
+from search_profile import SearchProfile
+from search_result import make_result
 
 class AStar:
-    def __init__(self, game_state):
+    def __init__(self, game_state, heuristic='nearest', queue='heap', trace='none', profile=False, telemetry=None):
+        """
+        heuristic: 'nearest' (luces apagadas + luz más cercana) o
+        'mst' (agrega el árbol de expansión mínima sobre las luces apagadas)
+        queue: 'heap' (heap binario) o 'bucket' (cubetas por f, desempate por mayor g)
+        trace: 'none', 'cells' o 'full' (ver search_trace.py)
+        profile: si es True agrega al resultado el tiempo y las llamadas por
+        fase (ver search_profile.py)
+        telemetry: SearchTelemetry opcional que recibe eventos de progreso
+        durante solve() (ver search_telemetry.py)
+        """
         self.game_state = game_state
+        self.heuristic = game_state.get_heuristic(heuristic)
+        self.queue_class = get_queue_class(queue)
+        self.trace = trace
+        self.profile = profile
+        self.telemetry = telemetry
         self.nodes_explored = 0
         self.visited_nodes = []
 
     def solve(self):
         """Ejecuta el algoritmo A* para encontrar la solución"""
+        if self.telemetry is not None:
+            return self.telemetry.run(self.steps)
+
+        for snapshot in self.steps():
+            pass
+        return snapshot['result']
+
+    def steps(self, batch_size=None):
+        """
+        Ejecuta A* por pasos: generador que expande hasta `batch_size` nodos
+        entre cada snapshot de progreso (ver search_progress.make_snapshot).
+        El último snapshot tiene done=True y el resultado. La búsqueda se
+        pausa entre llamadas a next() y se abandona cerrando el generador.
+        Sin batch_size solo se produce el snapshot final.
+        """
         self.nodes_explored = 0
-        self.visited_nodes = []
-        start_time = time.perf_counter()
-    
-        initial_node = self.game_state.get_initial_node()
-        initial_node.heuristic = self.game_state.heuristic(initial_node)
-        initial_node.total_cost = initial_node.cost + initial_node.heuristic
-
-        open_set = PriorityQueue()
-        closed_set = set()
-    
-        open_set.enqueue(initial_node)
-        visit_counter = 0
+        clock = SearchClock()
+        next_snapshot = batch_size or 0
+
+        game_state = self.game_state
+        store = NodeStore()
+        trace = SearchTrace(self.trace, game_state)
+        record = trace.record if trace.enabled else None
+        open_set = self.queue_class()
+
+        # Funciones del bucle principal (cronometradas solo si hay perfil)
+        profile = SearchProfile(self.profile)
+        expand = profile.wrap('expand', game_state.expand, count_items=True)
+        heuristic_fn = profile.wrap('heuristic', self.heuristic)
+        is_goal_state = profile.wrap('goal_test', game_state.is_goal_state)
+        add_node = profile.wrap('store', store.add)
+        enqueue = profile.wrap('push', open_set.enqueue)
+        dequeue = profile.wrap('pop', open_set.dequeue)
+
+        initial_state = game_state.get_initial_state()
+        initial_heuristic = heuristic_fn(initial_state)
+        initial_index = add_node(initial_state, heuristic=initial_heuristic)
+
+        # Índice del conjunto abierto: estado -> mejor g conocido.
+        # Solo se encola un estado si mejora su g; las entradas del heap que
+        # quedan con peor g se descartan al salir sin expandirlas.
+        best_cost = {initial_state: 0}
+        peak_frontier = 0
+        duplicates_skipped = 0
+        stale_skipped = 0
+        current_f = initial_heuristic
+
+        if game_state.start_states():
+            enqueue(initial_index, initial_heuristic, 0)
+            peak_frontier = 1
 
         while not open_set.is_empty():
-            current_node = open_set.dequeue()
+            current_index = dequeue()
+            current_state = store.states[current_index]
+            current_cost = store.costs[current_index]
+
+            if current_cost > best_cost[current_state]:
+                stale_skipped += 1
+                continue
+
             self.nodes_explored += 1
-            visit_counter += 1
-            current_node.visited_order = visit_counter
-            self.visited_nodes.append(current_node)
+            if record:
+                record(self.nodes_explored, current_index, current_state)
 
             # Verificar si llegamos a la meta
-            if self.game_state.is_goal(current_node):
-                end_time = time.perf_counter()
-                return {
-                    'success': True,
-                    'path': current_node.get_path(),
-                    'nodes_explored': self.nodes_explored,
-                    'execution_time': (end_time - start_time) * 1000,
-                    'steps': current_node.cost,
-                    'visited_nodes': self.visited_nodes,
-                    'final_node': current_node
-                }
-
-            current_key = current_node.get_key()
-            if current_key in closed_set:
-                continue
-        
-            closed_set.add(current_key)
+            if is_goal_state(current_state):
+                result = self._result(True, store, current_index, trace, clock)
+                result.update(peak_frontier=peak_frontier, duplicates_skipped=duplicates_skipped,
+                              stale_skipped=stale_skipped)
+                result.update(profile.result_fields(peak_frontier=peak_frontier, closed_set_size=profile.calls('expand'),
+                                                    duplicates=duplicates_skipped))
+                yield make_snapshot(self.nodes_explored, open_set.size(), current_cost, result['execution_time'], result)
+                return
 
             # Generar sucesores
-            successors = self.game_state.get_successors(current_node)
-        
-            for successor in successors:
-                successor_key = successor.get_key()
-            
-                if successor_key not in closed_set:
-                    successor.heuristic = self.game_state.heuristic(successor)
-                    successor.total_cost = successor.cost + successor.heuristic
-                    open_set.enqueue(successor)
-
-        end_time = time.perf_counter()
-        return {
-            'success': False,
-            'path': [],
-            'nodes_explored': self.nodes_explored,
-            'execution_time': (end_time - start_time) * 1000,
-            'steps': 0,
-            'visited_nodes': self.visited_nodes,
-            'final_node': None
-        }
\ No newline at end of file
+            successor_cost = current_cost + 1
+
+            for successor_state, action in expand(current_state):
+                known_cost = best_cost.get(successor_state)
+                if known_cost is not None and known_cost <= successor_cost:
+                    duplicates_skipped += 1
+                    continue
+
+                best_cost[successor_state] = successor_cost
+                heuristic = heuristic_fn(successor_state)
+                successor_index = add_node(successor_state, current_index, action, successor_cost, heuristic)
+                enqueue(successor_index, successor_cost + heuristic, successor_cost)
+
+            if open_set.size() > peak_frontier:
+                peak_frontier = open_set.size()
+
+            # Ceder el control cada batch_size nodos expandidos
+            if next_snapshot and self.nodes_explored >= next_snapshot:
+                next_snapshot += batch_size
+                current_f = current_cost + store.heuristics[current_index]
+                clock.pause()
+                yield make_snapshot(self.nodes_explored, open_set.size(), current_f, clock.elapsed_ms())
+                clock.resume()
+
+        result = self._result(False, store, None, trace, clock)
+        result.update(peak_frontier=peak_frontier, duplicates_skipped=duplicates_skipped,
+                      stale_skipped=stale_skipped)
+        result.update(profile.result_fields(peak_frontier=peak_frontier, closed_set_size=profile.calls('expand'),
+                                            duplicates=duplicates_skipped))
+        yield make_snapshot(self.nodes_explored, 0, current_f, result['execution_time'], result)
+
+    def _result(self, success, store, final_index, trace, clock):
+        """Construye el diccionario de resultado"""
+        execution_time = clock.elapsed_ms()
+        trace_fields = trace.result_fields(store)
+        self.visited_nodes = trace_fields['visited_nodes']
+
+        return make_result(
+            self.game_state, success, store.get_path(final_index) if success else [], self.nodes_explored,
+            execution_time, store.make_node(final_index, self.game_state, self.nodes_explored) if success else None,
+            **trace_fields)
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""
+Resolución por lotes en paralelo con ProcessPoolExecutor
+
+Cada trabajo es un par (nivel, algoritmo). Los niveles se envían una sola
+vez a cada proceso (initializer) y cada proceso reutiliza sus GameState
+precompilados entre trabajos, hasta WORKER_STATE_BUDGET estados en total
+por proceso. Los resultados se entregan en orden de finalización.
+
+Uso:
+    python batch_solver.py [--levels archivo.json] [--algorithms astar bfs]
+                           [--workers N] [--timeout SEGUNDOS] [--precompile]
+                           [--pruning forced-light-on dead-ends]
+"""
+import argparse
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from game_state import GameState, PRUNING_RULES
+from state_graph import MAX_GRAPH_STATES
+from astar import AStar
+from bfs import BFS
+from idastar import IDAStar
+from held_karp import HeldKarp
+from layer_bfs import LayerBFS
+from light_graph import LightGraphSolver
+from levels import LEVELS
+from search_result import make_result
+
+# Algoritmos disponibles por nombre
+ALGORITHMS = {
+    'astar': lambda game_state: AStar(game_state),
+    'astar-mst': lambda game_state: AStar(game_state, heuristic='mst'),
+    'astar-bucket': lambda game_state: AStar(game_state, queue='bucket'),
+    'bfs': lambda game_state: BFS(game_state),
+    'bfs-bidirectional': lambda game_state: BFS(game_state, bidirectional=True),
+    'bfs-layer': lambda game_state: LayerBFS(game_state),
+    'idastar': lambda game_state: IDAStar(game_state),
+    'held-karp': lambda game_state: HeldKarp(game_state),
+    'light-graph': lambda game_state: LightGraphSolver(game_state),
+}
+
+# Campos del resultado que se devuelven al proceso principal
+RESULT_FIELDS = ('success', 'path', 'steps', 'nodes_explored', 'execution_time',
+                 'peak_frontier', 'duplicates_skipped', 'stale_skipped', 'iterations', 'unreachable_lights')
+
+# Cada cuántos nodos se revisa el tiempo límite de un trabajo
+TIMEOUT_CHECK_BATCH = 1000
+
+# Estados de grafos precalculados que conserva cada proceso entre trabajos
+# (un GameState sin grafo cuenta como sus celdas)
+WORKER_STATE_BUDGET = MAX_GRAPH_STATES
+
+_worker_levels = {}
+_worker_precompile = False
+_worker_pruning = ()
+_worker_game_states = OrderedDict()
+
+
+def _init_worker(levels, precompile=False, pruning=()):
+    """Inicializa un proceso con el paquete de niveles completo"""
+    global _worker_levels, _worker_precompile, _worker_pruning
+    _worker_levels = levels
+    _worker_precompile = precompile
+    _worker_pruning = pruning
+    _worker_game_states.clear()
+
+
+def _cached_states(game_state):
+    """Peso de un GameState en el presupuesto de WORKER_STATE_BUDGET"""
+    if game_state.state_graph is not None:
+        return len(game_state.state_graph)
+    return game_state.compiled.size
+
+
+def _get_game_state(level_key, time_limit=None):
+    """
+    GameState precompilado del nivel, reutilizado entre trabajos del mismo
+    proceso. Retorna (game_state, timed_out): timed_out indica que el
+    grafo no terminó de precalcularse en time_limit segundos.
+    """
+    game_state = _worker_game_states.get(level_key)
+    if game_state is not None:
+        _worker_game_states.move_to_end(level_key)
+        return game_state, False
+
+    level = _worker_levels[level_key]
+    robot_x, robot_y = level['robot_start']
+    game_state = GameState(level['grid'], robot_x, robot_y, _worker_pruning)
+    timed_out = False
+    if _worker_precompile:
+        # Si el grafo no cabe o no termina a tiempo, se siguen generando los sucesores al vuelo
+        try:
+            game_state.precompile_graph(WORKER_STATE_BUDGET, time_limit)
+        except ValueError:
+            pass
+        except TimeoutError:
+            timed_out = True
+
+    _worker_game_states[level_key] = game_state
+    total = sum(_cached_states(cached) for cached in _worker_game_states.values())
+    while total > WORKER_STATE_BUDGET and len(_worker_game_states) > 1:
+        _, evicted = _worker_game_states.popitem(last=False)
+        total -= _cached_states(evicted)
+    return game_state, timed_out
+
+
+def run_job(level_key, algorithm, timeout=None):
+    """
+    Trabajo del pool: resuelve un nivel con un algoritmo y retorna el resumen
+    del trabajo. El precálculo del grafo del nivel cuenta dentro de timeout.
+    """
+    start_time = time.perf_counter()
+    game_state, timed_out = _get_game_state(level_key, timeout)
+    if timed_out:
+        summary = _summarize(make_result(game_state, False, [], 0, (time.perf_counter() - start_time) * 1000), True)
+    else:
+        if timeout is not None:
+            timeout = max(timeout - (time.perf_counter() - start_time), 0)
+        summary = solve_job(game_state, algorithm, timeout)
+    return {'level': level_key, 'algorithm': algorithm, 'result': summary}
+
+
+def solve_job(game_state, algorithm, timeout=None):
+    """
+    Resuelve un GameState con un algoritmo en el proceso actual y retorna
+    el resultado reducido a RESULT_FIELDS más 'timed_out'.
+    El tiempo límite es cooperativo: los algoritmos con steps() se revisan
+    cada TIMEOUT_CHECK_BATCH nodos; los demás reciben el límite en su
+    atributo time_limit y lo revisan en su propio bucle.
+    """
+    solver = ALGORITHMS[algorithm](game_state)
+    timed_out = False
+
+    if timeout is not None and hasattr(solver, 'steps'):
+        for snapshot in solver.steps(TIMEOUT_CHECK_BATCH):
+            if snapshot['done']:
+                result = snapshot['result']
+                break
+            if snapshot['elapsed_ms'] > timeout * 1000:
+                timed_out = True
+                result = make_result(solver.game_state, False, [], snapshot['nodes_explored'], snapshot['elapsed_ms'])
+                break
+    else:
+        if timeout is not None:
+            solver.time_limit = timeout
+        result = solver.solve()
+        timed_out = result.get('timed_out', False)
+
+    return _summarize(result, timed_out)
+
+
+def _summarize(result, timed_out):
+    """Resultado reducido a RESULT_FIELDS más 'timed_out'"""
+    summary = {field: result[field] for field in RESULT_FIELDS if field in result}
+    summary['timed_out'] = timed_out
+    return summary
+
+
+class BatchSolver:
+    def __init__(self, levels, max_workers=None, timeout=None, precompile=False, pruning=()):
+        """
+        levels: diccionario {clave: nivel} con el formato de levels.py
+        max_workers: procesos del pool (por defecto, uno por núcleo)
+        timeout: segundos máximos por trabajo (cooperativo, ver run_job)
+        precompile: si es True cada proceso precalcula el grafo de estados de
+        cada nivel (ver state_graph.py), útil al resolverlo con varios algoritmos;
+        el precálculo cuenta dentro del timeout del trabajo que lo provoca
+        pruning: reglas de poda de GameState (ver PRUNING_RULES)
+
+        Los procesos se reutilizan durante toda la vida del BatchSolver.
+        """
+        self.levels = levels
+        self.timeout = timeout
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                            initargs=(levels, precompile, tuple(pruning)))
+
+    def run(self, jobs):
+        """
+        Ejecuta los trabajos [(clave de nivel, algoritmo), ...] y produce
+        cada resultado en orden de finalización
+        """
+        futures = {}
+        for level_key, algorithm in jobs:
+            if algorithm not in ALGORITHMS:
+                raise ValueError(f"Algoritmo desconocido: {algorithm}")
+            future = self.executor.submit(run_job, level_key, algorithm, self.timeout)
+            futures[future] = (level_key, algorithm)
+
+        for future in as_completed(futures):
+            level_key, algorithm = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'level': level_key, 'algorithm': algorithm, 'result': None, 'error': str(e)}
+
+    def run_all(self, algorithms):
+        """Ejecuta todos los niveles con cada algoritmo indicado"""
+        return self.run((level_key, algorithm) for level_key in self.levels for algorithm in algorithms)
+
+    def close(self):
+        """Detiene los procesos del pool"""
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def aggregate(job_results):
+    """
+    Totales por algoritmo (nodos, tiempo, resueltos, fallidos, vencidos,
+    errores). Los resultados cacheados no tienen tiempo: se cuentan en
+    'cached' y no suman a execution_time
+    """
+    totals = {}
+    for job in job_results:
+        entry = totals.setdefault(job['algorithm'], {
+            'jobs': 0, 'solved': 0, 'failed': 0, 'timed_out': 0, 'errors': 0, 'cached': 0,
+            'nodes_explored': 0, 'execution_time': 0.0
+        })
+        entry['jobs'] += 1
+
+        result = job['result']
+        if result is None:
+            entry['errors'] += 1
+            continue
+
+        entry['nodes_explored'] += result['nodes_explored']
+        if result.get('cached'):
+            entry['cached'] += 1
+        else:
+            entry['execution_time'] += result['execution_time']
+        if result.get('timed_out'):
+            entry['timed_out'] += 1
+        elif result['success']:
+            entry['solved'] += 1
+        else:
+            entry['failed'] += 1
+    return totals
+
+
+def load_levels(path):
+    """Carga un paquete de niveles desde JSON (lista o diccionario de niveles)"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        data = {index: level for index, level in enumerate(data, 1)}
+    for level in data.values():
+        level['robot_start'] = tuple(level['robot_start'])
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolución de niveles por lotes en paralelo")
+    parser.add_argument('--levels', help="Archivo JSON con los niveles (por defecto, los de levels.py)")
+    parser.add_argument('--algorithms', nargs='+', default=['astar', 'bfs'], choices=sorted(ALGORITHMS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Procesos del pool")
+    parser.add_argument('--timeout', type=float, help="Segundos máximos por trabajo")
+    parser.add_argument('--precompile', action='store_true', help="Precalcular el grafo de estados de cada nivel")
+    parser.add_argument('--pruning', nargs='+', default=[], choices=PRUNING_RULES, help="Reglas de poda de sucesores")
+    args = parser.parse_args()
+
+    levels = load_levels(args.levels) if args.levels else LEVELS
+    results = []
+
+    with BatchSolver(levels, args.workers, args.timeout, args.precompile, args.pruning) as batch:
+        for job in batch.run_all(args.algorithms):
+            results.append(job)
+            result = job['result']
+            if result is None:
+                print(f"[{job['algorithm']}] nivel {job['level']}: ERROR {job['error']}")
+            elif result['timed_out']:
+                print(f"[{job['algorithm']}] nivel {job['level']}: tiempo agotado tras {result['nodes_explored']} nodos")
+            elif result.get('unreachable_lights'):
+                print(f"[{job['algorithm']}] nivel {job['level']}: sin solución, luces inalcanzables "
+                      f"{', '.join(str(tuple(position)) for position in result['unreachable_lights'])}")
+            else:
+                print(f"[{job['algorithm']}] nivel {job['level']}: {result['nodes_explored']} nodos, "
+                      f"{result['steps']} pasos, {result['execution_time']:.2f}ms")
+
+    print("\nRESUMEN TOTAL:")
+    for algorithm, total in aggregate(results).items():
+        print(f"{algorithm}: {total['solved']}/{total['jobs']} resueltos, {total['nodes_explored']} nodos totales, "
+              f"{total['execution_time']:.2f}ms totales, {total['timed_out']} sin tiempo, {total['errors']} errores")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
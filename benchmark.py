@@ -0,0 +1,142 @@
+"""
+Benchmark de los solucionadores con calentamiento y repeticiones
+
+Cada par (nivel, algoritmo) se ejecuta primero `warmup` veces sin medir y
+luego `repetitions` veces midiendo el tiempo; se reportan mediana, p95 y
+desviación estándar, junto con los nodos explorados y el pico de memoria
+(medido con tracemalloc en una ejecución aparte para no alterar los tiempos).
+
+Uso:
+    python benchmark.py [--levels archivo.json] [--algorithms astar bfs]
+                        [--repetitions N] [--warmup N] [--json reporte.json] [--csv reporte.csv]
+                        [--pruning forced-light-on dead-ends]
+    python benchmark.py --sizes 8 12 16 --lights 3 5 7 [--density 0.2] [--style maze]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from game_state import GameState, PRUNING_RULES
+from batch_solver import ALGORITHMS, load_levels
+from benchmark_report import environment_metadata, write_csv, write_json
+from level_generator import STYLES, generate_level
+from levels import LEVELS
+
+def benchmark_level(level, algorithm, repetitions=5, warmup=1, pruning=()):
+    """
+    Mide un algoritmo sobre un nivel. Cada ejecución usa un GameState nuevo
+    (construido fuera de la medición) para que las memoizaciones de una
+    repetición no abaraten las siguientes. pruning: reglas de poda de GameState
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconocido: {algorithm}")
+    if repetitions < 1:
+        raise ValueError(f"Número de repeticiones inválido: {repetitions}")
+
+    def run():
+        solver = ALGORITHMS[algorithm](GameState(level['grid'], *level['robot_start'], pruning))
+        start_time = time.perf_counter()
+        result = solver.solve()
+        return result, (time.perf_counter() - start_time) * 1000
+
+    for _ in range(warmup):
+        run()
+
+    times = []
+    for _ in range(repetitions):
+        result, elapsed = run()
+        times.append(elapsed)
+
+    # Pico de memoria en una ejecución aparte (tracemalloc ralentiza la búsqueda)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times.sort()
+    grid = level['grid']
+    return {
+        'algorithm': algorithm,
+        'level': level['name'],
+        'rows': len(grid),
+        'cols': len(grid[0]),
+        'lights': sum(row.count(2) for row in grid),
+        'repetitions': repetitions,
+        'pruning': ' '.join(sorted(pruning)),
+        'success': result['success'],
+        'steps': result['steps'],
+        'nodes_explored': result['nodes_explored'],
+        'time_median': statistics.median(times),
+        'time_p95': _percentile(times, 95),
+        'time_stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'time_min': times[0],
+        'peak_memory_kb': peak / 1024
+    }
+
+def _percentile(sorted_values, percent):
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    rank = max(1, -(-percent * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+def run_benchmark(levels, algorithms, repetitions=5, warmup=1, pruning=()):
+    """Mide cada nivel con cada algoritmo y produce las filas de resultados"""
+    for level_key, level in levels.items():
+        for algorithm in algorithms:
+            row = benchmark_level(level, algorithm, repetitions, warmup, pruning)
+            row['level_key'] = level_key
+            yield row
+
+def scaling_levels(sizes, light_counts, density=0.2, style='open', seed=0):
+    """Niveles generados para estudiar el escalado por tamaño y número de luces"""
+    return {
+        f"{size}x{size}-{lights}": generate_level(size, size, lights, density, style, seed=f"{seed}-{size}-{lights}",
+                                                  name=f"{size}x{size}, {lights} luces")
+        for size in sizes
+        for lights in light_counts
+    }
+
+def print_rows(rows):
+    """Imprime los resultados como tabla"""
+    print(f"{'nivel':<22} {'algoritmo':<18} {'nodos':>9} {'pasos':>5} {'mediana':>10} "
+          f"{'p95':>10} {'desv.':>8} {'memoria':>10}")
+    for row in rows:
+        steps = row['steps'] if row['success'] else '-'
+        print(f"{row['level']:<22} {row['algorithm']:<18} {row['nodes_explored']:>9} {steps:>5} "
+              f"{row['time_median']:>8.2f}ms {row['time_p95']:>8.2f}ms {row['time_stdev']:>6.2f}ms "
+              f"{row['peak_memory_kb']:>8.1f}KB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los solucionadores LightBot")
+    parser.add_argument('--levels', help="Archivo JSON con los niveles (por defecto, los de levels.py)")
+    parser.add_argument('--algorithms', nargs='+', default=['astar', 'bfs'], choices=sorted(ALGORITHMS))
+    parser.add_argument('--repetitions', type=int, default=5, help="Ejecuciones medidas por par")
+    parser.add_argument('--warmup', type=int, default=1, help="Ejecuciones de calentamiento sin medir")
+    parser.add_argument('--sizes', type=int, nargs='+', help="Lados de tablero para el estudio de escalado")
+    parser.add_argument('--lights', type=int, nargs='+', default=[3, 5], help="Números de luces para el escalado")
+    parser.add_argument('--density', type=float, default=0.2, help="Densidad de obstáculos para el escalado")
+    parser.add_argument('--style', choices=STYLES, default='open', help="Estilo de los niveles de escalado")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Guarda los resultados en un reporte JSON")
+    parser.add_argument('--csv', help="Guarda los resultados en un reporte CSV")
+    parser.add_argument('--pruning', nargs='+', default=[], choices=PRUNING_RULES, help="Reglas de poda de sucesores")
+    args = parser.parse_args()
+
+    if args.sizes:
+        levels = scaling_levels(args.sizes, args.lights, args.density, args.style, args.seed)
+    else:
+        levels = load_levels(args.levels) if args.levels else LEVELS
+
+    print(f"=== Benchmark: {len(levels)} niveles, {args.warmup} calentamiento, {args.repetitions} repeticiones ===")
+    metadata = environment_metadata()
+    rows = list(run_benchmark(levels, args.algorithms, args.repetitions, args.warmup, args.pruning))
+    print_rows(rows)
+
+    if args.json:
+        write_json(rows, args.json, metadata)
+    if args.csv:
+        write_csv(rows, args.csv, metadata)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
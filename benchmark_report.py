@@ -0,0 +1,161 @@
+"""
+Reportes de benchmark legibles por máquina y detección de regresiones
+
+Los resultados de benchmark.py se guardan en JSON (metadatos del entorno +
+filas) o CSV (una fila por par, con los metadatos repetidos en columnas).
+El comando compare compara dos reportes y termina con código distinto de
+cero si el tiempo mediano o los nodos explorados empeoran más que el umbral,
+si un par resuelto en la base deja de resolverse o si falta en el nuevo.
+
+Uso:
+    python benchmark_report.py compare base.json nuevo.json [--threshold 10]
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+# Métricas vigiladas por compare (mayor es peor)
+COMPARED_METRICS = ('time_median', 'nodes_explored')
+METADATA_FIELDS = ('timestamp', 'python', 'implementation', 'platform', 'machine', 'cpu_count', 'commit')
+
+def environment_metadata():
+    """Describe el entorno de la medición (intérprete, plataforma, commit)"""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'commit': _git_commit()
+    }
+
+def _git_commit():
+    """Commit actual del repositorio, o None si no está disponible"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+def write_json(rows, path, metadata=None):
+    """Guarda las filas de resultados con los metadatos del entorno"""
+    report = {'metadata': metadata or environment_metadata(), 'results': list(rows)}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+def write_csv(rows, path, metadata=None):
+    """Guarda las filas de resultados en CSV, con los metadatos como columnas"""
+    metadata = metadata or environment_metadata()
+    rows = [{**row, **metadata} for row in rows]
+    if not rows:
+        raise ValueError(f"No hay resultados que guardar en {path}")
+
+    fields = list(rows[0])
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def load_report(path):
+    """Carga un reporte JSON o CSV y retorna (metadatos, filas)"""
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        metadata = {field: rows[0].get(field) for field in METADATA_FIELDS} if rows else {}
+        for row in rows:
+            for metric in COMPARED_METRICS:
+                row[metric] = float(row[metric])
+            row['success'] = row['success'] == 'True'
+        return metadata, rows
+
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return report['metadata'], report['results']
+
+def compare_reports(base_rows, new_rows, threshold=10.0):
+    """
+    Compara dos reportes por par (nivel, algoritmo). Retorna la lista de
+    cambios con el porcentaje de variación de cada métrica y si supera el
+    umbral (en %) como regresión. También son regresiones (con change=None)
+    los pares de la base que faltan en el nuevo reporte ('missing') y los
+    que dejaron de resolverse ('success').
+    """
+    new_by_key = {(str(row['level_key']), row['algorithm']): row for row in new_rows}
+    changes = []
+
+    for previous in base_rows:
+        key = (str(previous['level_key']), previous['algorithm'])
+        row = new_by_key.get(key)
+        if row is None:
+            changes.append(_status_change(key, 'missing', 'presente', 'ausente', True))
+            continue
+
+        if previous['success'] != row['success']:
+            changes.append(_status_change(key, 'success', previous['success'], row['success'], previous['success']))
+
+        for metric in COMPARED_METRICS:
+            old, new = float(previous[metric]), float(row[metric])
+            change = ((new - old) / old) * 100 if old else 0.0
+            changes.append({
+                'level_key': key[0],
+                'algorithm': key[1],
+                'metric': metric,
+                'base': old,
+                'new': new,
+                'change': change,
+                'regression': change > threshold
+            })
+
+    return changes
+
+def _status_change(key, metric, old, new, regression):
+    """Cambio de un par que no se mide en porcentaje (par ausente o éxito distinto)"""
+    return {
+        'level_key': key[0],
+        'algorithm': key[1],
+        'metric': metric,
+        'base': old,
+        'new': new,
+        'change': None,
+        'regression': regression
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Reportes de benchmark LightBot")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compare = subparsers.add_parser('compare', help="Compara dos reportes y detecta regresiones")
+    compare.add_argument('base', help="Reporte de referencia (JSON o CSV)")
+    compare.add_argument('new', help="Reporte nuevo (JSON o CSV)")
+    compare.add_argument('--threshold', type=float, default=10.0, help="Empeoramiento máximo tolerado en %%")
+    args = parser.parse_args()
+
+    base_metadata, base_rows = load_report(args.base)
+    new_metadata, new_rows = load_report(args.new)
+    print(f"Base:  commit {base_metadata.get('commit')}, {base_metadata.get('timestamp')}")
+    print(f"Nuevo: commit {new_metadata.get('commit')}, {new_metadata.get('timestamp')}")
+
+    changes = compare_reports(base_rows, new_rows, args.threshold)
+    regressions = [change for change in changes if change['regression']]
+
+    for change in changes:
+        marker = "REGRESIÓN" if change['regression'] else ""
+        if change['change'] is None:
+            print(f"  {change['level_key']:<14} {change['algorithm']:<18} {change['metric']:<15} "
+                  f"{str(change['base']):>12} -> {str(change['new']):>12} {'':>10} {marker}")
+            continue
+        print(f"  {change['level_key']:<14} {change['algorithm']:<18} {change['metric']:<15} "
+              f"{change['base']:>12.2f} -> {change['new']:>12.2f} ({change['change']:+7.1f}%) {marker}")
+
+    print(f"\n{len(regressions)} regresiones de {len(changes)} métricas comparadas (umbral {args.threshold}%)")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,68 +1,284 @@
 """
 Implementación del algoritmo BFS (Búsqueda en Anchura)
 """
-import time
 from collections import deque
+from node_store import NodeStore, NO_PARENT
+from search_trace import SearchTrace
+from search_progress import SearchClock, make_snapshot
+from search_profile import SearchProfile
+from search_result import make_result
+from state_set import make_visited_set
 
 class BFS:
-    def __init__(self, game_state):
+    def __init__(self, game_state, bidirectional=False, trace='none', profile=False, telemetry=None):
+        """
+        bidirectional: si es True busca a la vez desde el inicio y desde todos
+        los estados meta, encontrándose en el medio
+        trace: 'none', 'cells' o 'full' (ver search_trace.py)
+        profile: si es True agrega al resultado el tiempo y las llamadas por
+        fase (ver search_profile.py)
+        telemetry: SearchTelemetry opcional que recibe eventos de progreso
+        durante solve() (ver search_telemetry.py)
+        """
         self.game_state = game_state
+        self.bidirectional = bidirectional
+        self.trace = trace
+        self.profile = profile
+        self.telemetry = telemetry
         self.nodes_explored = 0
         self.visited_nodes = []
+        self._batch_size = None
+        self._next_snapshot = 0
+        self._clock = None
+        self._profile = None
 
     def solve(self):
         """Ejecuta el algoritmo BFS para encontrar la solución"""
+        if self.telemetry is not None:
+            return self.telemetry.run(self.steps)
+
+        for snapshot in self.steps():
+            pass
+        return snapshot['result']
+
+    def steps(self, batch_size=None):
+        """
+        Ejecuta BFS por pasos: generador que expande hasta `batch_size` nodos
+        entre cada snapshot de progreso (ver search_progress.make_snapshot).
+        El último snapshot tiene done=True y el resultado. La búsqueda se
+        pausa entre llamadas a next() y se abandona cerrando el generador.
+        Sin batch_size solo se produce el snapshot final.
+        """
         self.nodes_explored = 0
-        self.visited_nodes = []
-        start_time = time.perf_counter()
-        
-        initial_node = self.game_state.get_initial_node()
-        queue = deque([initial_node])
-        visited = set()
-        visit_counter = 0
+        self._batch_size = batch_size
+        self._next_snapshot = batch_size or 0
+        self._clock = SearchClock()
+        self._profile = SearchProfile(self.profile)
+
+        if self.bidirectional:
+            yield from self._steps_bidirectional()
+        else:
+            yield from self._steps_forward()
+
+    def _steps_forward(self):
+        """BFS clásica hacia adelante desde el estado inicial"""
+        clock = self._clock
+
+        game_state = self.game_state
+        store = NodeStore()
+        trace = SearchTrace(self.trace, game_state)
+        record = trace.record if trace.enabled else None
+
+        queue = deque()
+        # Un byte por estado posible, indexado por el estado (ver state_set.py)
+        visited = make_visited_set(game_state)
+
+        # Funciones del bucle principal (cronometradas solo si hay perfil)
+        profile = self._profile
+        expand = profile.wrap('expand', game_state.expand, count_items=True)
+        is_goal_state = profile.wrap('goal_test', game_state.is_goal_state)
+        add_node = profile.wrap('store', store.add)
+        push = profile.wrap('push', queue.append)
+        pop = profile.wrap('pop', queue.popleft)
+        peak_frontier = 0
+
+        for state in game_state.start_states():
+            push(add_node(state))
+            peak_frontier = 1
 
         while queue:
-            current_node = queue.popleft()
+            current_index = pop()
             self.nodes_explored += 1
-            visit_counter += 1
-            current_node.visited_order = visit_counter
-            self.visited_nodes.append(current_node)
+            current_state = store.states[current_index]
+            if record:
+                record(self.nodes_explored, current_index, current_state)
 
             # Verificar si llegamos a la meta
-            if self.game_state.is_goal(current_node):
-                end_time = time.perf_counter()
-                return {
-                    'success': True,
-                    'path': current_node.get_path(),
-                    'nodes_explored': self.nodes_explored,
-                    'execution_time': (end_time - start_time) * 1000,  # en ms
-                    'steps': current_node.cost,
-                    'visited_nodes': self.visited_nodes,
-                    'final_node': current_node
-                }
-
-            current_key = current_node.get_key()
-            if current_key in visited:
+            if is_goal_state(current_state):
+                result = self._result(True, store.get_path(current_index), store, current_index, trace)
+                result.update(self._forward_profile_fields(True, peak_frontier))
+                yield make_snapshot(self.nodes_explored, len(queue), store.costs[current_index],
+                                    result['execution_time'], result)
+                return
+
+            if visited[current_state]:
                 continue
-            
-            visited.add(current_key)
+
+            visited[current_state] = 1
 
             # Generar sucesores
-            successors = self.game_state.get_successors(current_node)
-            
-            for successor in successors:
-                successor_key = successor.get_key()
-                
-                if successor_key not in visited:
-                    queue.append(successor)
-
-        end_time = time.perf_counter()
-        return {
-            'success': False,
-            'path': [],
-            'nodes_explored': self.nodes_explored,
-            'execution_time': (end_time - start_time) * 1000,
-            'steps': 0,
-            'visited_nodes': self.visited_nodes,
-            'final_node': None
-        }
\ No newline at end of file
+            successor_cost = store.costs[current_index] + 1
+
+            for successor_state, action in expand(current_state):
+                if not visited[successor_state]:
+                    push(add_node(successor_state, current_index, action, successor_cost))
+
+            if profile.enabled and len(queue) > peak_frontier:
+                peak_frontier = len(queue)
+
+            # Ceder el control cada batch_size nodos expandidos
+            if self._next_snapshot and self.nodes_explored >= self._next_snapshot:
+                self._next_snapshot += self._batch_size
+                clock.pause()
+                yield make_snapshot(self.nodes_explored, len(queue), successor_cost - 1, clock.elapsed_ms())
+                clock.resume()
+
+        result = self._result(False, [], store, None, trace)
+        result.update(self._forward_profile_fields(False, peak_frontier))
+        yield make_snapshot(self.nodes_explored, 0, 0, result['execution_time'], result)
+
+    def _forward_profile_fields(self, success, peak_frontier):
+        """
+        Campos del perfil de la BFS hacia adelante. Los duplicados se deducen
+        de los contadores: sucesores descartados por ya visitados más nodos
+        sacados de la cola cuyo estado ya se había expandido. Sin búsqueda
+        (luces inalcanzables) no hay ni siquiera el push del estado inicial.
+        """
+        profile = self._profile
+        if not profile.enabled:
+            return profile.result_fields()
+
+        initial_pushes = min(profile.calls('push'), 1)
+        filtered = profile.items('expand') - (profile.calls('push') - initial_pushes)
+        popped_again = profile.calls('pop') - profile.calls('expand') - (1 if success else 0)
+        return profile.result_fields(peak_frontier=peak_frontier, closed_set_size=profile.calls('expand'),
+                                     duplicates=filtered + popped_again)
+
+    def _steps_bidirectional(self):
+        """
+        BFS bidireccional: una búsqueda hacia adelante desde el estado inicial y
+        otra hacia atrás desde todos los estados (celda, todas encendidas).
+        Siempre expande la capa completa de la frontera más pequeña, y al
+        encontrarse se queda con el mejor cruce de esa capa, por lo que el
+        camino sigue siendo óptimo.
+        """
+        game_state = self.game_state
+        store = NodeStore()
+        trace = SearchTrace(self.trace, game_state)
+        record = trace.record if trace.enabled else None
+
+        initial_state = game_state.get_initial_state()
+        initial_index = store.add(initial_state)
+        if game_state.is_goal_state(initial_state):
+            self.nodes_explored = 1
+            if record:
+                record(1, initial_index, initial_state)
+            result = self._result(True, [], store, initial_index, trace)
+            yield make_snapshot(1, 0, 0, result['execution_time'], result)
+            return
+
+        # Estado -> índice en el almacén, uno por dirección
+        forward = {initial_state: initial_index}
+        backward = {state: store.add(state) for state in game_state.get_goal_states()}
+        forward_frontier = list(game_state.start_states())
+        backward_frontier = list(backward)
+
+        # Profundidades alcanzadas: su suma acota por debajo el largo de la solución
+        forward_depth = 0
+        backward_depth = 0
+
+        # Sucesores y predecesores (cronometrados solo si hay perfil)
+        profile = self._profile
+        expand = profile.wrap('expand', game_state.expand, count_items=True)
+        expand_reverse = profile.wrap('expand_reverse', game_state.expand_reverse, count_items=True)
+        peak_frontier = len(forward_frontier) + len(backward_frontier) if forward_frontier else 0
+
+        while forward_frontier and backward_frontier:
+            bound = forward_depth + backward_depth
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = yield from self._expand_layer(
+                    forward_frontier, forward, backward, expand, store, record,
+                    len(backward_frontier), bound)
+                forward_depth += 1
+            else:
+                backward_frontier, meeting = yield from self._expand_layer(
+                    backward_frontier, backward, forward, expand_reverse, store, record,
+                    len(forward_frontier), bound)
+                backward_depth += 1
+            peak_frontier = max(peak_frontier, len(forward_frontier) + len(backward_frontier))
+
+            if meeting is not None:
+                path = store.get_path(forward[meeting]) + store.get_reverse_path(backward[meeting])
+                goal_index = backward[meeting]
+                while store.parents[goal_index] != NO_PARENT:
+                    goal_index = store.parents[goal_index]
+                result = self._result(True, path, store, goal_index, trace)
+                result.update(self._bidirectional_profile_fields(peak_frontier))
+                yield make_snapshot(self.nodes_explored, len(forward_frontier) + len(backward_frontier),
+                                    len(path), result['execution_time'], result)
+                return
+
+        result = self._result(False, [], store, None, trace)
+        result.update(self._bidirectional_profile_fields(peak_frontier))
+        yield make_snapshot(self.nodes_explored, 0, forward_depth + backward_depth,
+                            result['execution_time'], result)
+
+    def _bidirectional_profile_fields(self, peak_frontier):
+        """Campos del perfil de la BFS bidireccional (duplicados: sucesores ya conocidos)"""
+        profile = self._profile
+        if not profile.enabled:
+            return profile.result_fields()
+
+        generated = profile.items('expand') + profile.items('expand_reverse')
+        closed = profile.calls('expand') + profile.calls('expand_reverse')
+        return profile.result_fields(peak_frontier=peak_frontier, closed_set_size=closed,
+                                     duplicates=generated - profile.calls('store'))
+
+    def _expand_layer(self, frontier, own, other, successor_fn, store, record, other_frontier_size, bound):
+        """
+        Expande una capa completa en una dirección (generador: cede snapshots
+        de progreso) y retorna (siguiente capa, mejor estado de encuentro o None)
+        """
+        clock = self._clock
+        add_node = self._profile.wrap('store', store.add)
+        next_frontier = []
+        meeting = None
+        meeting_cost = None
+
+        for position, state in enumerate(frontier, 1):
+            index = own[state]
+            self.nodes_explored += 1
+            if record:
+                record(self.nodes_explored, index, state)
+            successor_cost = store.costs[index] + 1
+
+            for successor_state, action in successor_fn(state):
+                if successor_state in own:
+                    continue
+
+                own[successor_state] = add_node(successor_state, index, action, successor_cost)
+                next_frontier.append(successor_state)
+
+                # Cruce con la otra búsqueda: se guarda el más corto de la capa
+                other_index = other.get(successor_state)
+                if other_index is not None:
+                    total_cost = successor_cost + store.costs[other_index]
+                    if meeting_cost is None or total_cost < meeting_cost:
+                        meeting = successor_state
+                        meeting_cost = total_cost
+
+            # Ceder el control cada batch_size nodos expandidos
+            if self._next_snapshot and self.nodes_explored >= self._next_snapshot:
+                self._next_snapshot += self._batch_size
+                frontier_size = len(frontier) - position + len(next_frontier) + other_frontier_size
+                clock.pause()
+                yield make_snapshot(self.nodes_explored, frontier_size, bound, clock.elapsed_ms())
+                clock.resume()
+
+        return next_frontier, meeting
+
+    def _result(self, success, path, store, final_index, trace):
+        """Construye el diccionario de resultado"""
+        trace_fields = trace.result_fields(store)
+        self.visited_nodes = trace_fields['visited_nodes']
+
+        final_node = None
+        if success:
+            # En la búsqueda bidireccional el nodo meta pertenece a la búsqueda
+            # hacia atrás, así que su costo se toma del largo del camino
+            final_node = store.make_node(final_index, self.game_state, self.nodes_explored)
+            final_node.cost = len(path)
+            final_node.total_cost = len(path)
+
+        return make_result(self.game_state, success, path, self.nodes_explored, self._clock.elapsed_ms(),
+                           final_node, **trace_fields, **self._profile.result_fields())
\ No newline at end of file
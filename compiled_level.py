@@ -0,0 +1,86 @@
+"""
+Modelo precompilado de un nivel: tablero plano, tabla de vecinos por
+celda y mapa celda -> índice de luz.
+
+Se construye una sola vez por nivel para que la generación de sucesores
+sea solo consulta de tablas.
+"""
+from array import array
+from collections import deque
+
+# Desplazamientos de cada movimiento, en el mismo orden que los códigos de acción
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+NO_LIGHT = -1
+UNREACHABLE = -1
+
+class CompiledLevel:
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.size = self.rows * self.cols
+
+        # Tablero plano: celda = fila * cols + columna
+        self.cells = array('b', (cell for row in grid for cell in row))
+
+        # Mapa celda -> índice de luz (orden fila por fila) y su inverso
+        self.light_index = array('i', [NO_LIGHT] * self.size)
+        self.light_cells = []
+        for cell in range(self.size):
+            if self.cells[cell] == 2:
+                self.light_index[cell] = len(self.light_cells)
+                self.light_cells.append(cell)
+
+        # Pares (vecino, código de acción) legales para cada celda
+        self.neighbors = [self._legal_moves(cell) for cell in range(self.size)]
+
+    def _legal_moves(self, cell):
+        """Calcula los movimientos legales desde una celda"""
+        if self.cells[cell] == 1:
+            return ()
+
+        x, y = divmod(cell, self.cols)
+        moves = []
+        for code, (dx, dy) in enumerate(MOVES):
+            new_x = x + dx
+            new_y = y + dy
+            if 0 <= new_x < self.rows and 0 <= new_y < self.cols:
+                neighbor = new_x * self.cols + new_y
+                if self.cells[neighbor] != 1:
+                    moves.append((neighbor, code))
+        return tuple(moves)
+
+    def distances_from(self, source):
+        """
+        Calcula la distancia real (en movimientos, evitando obstáculos) desde
+        una celda a todas las demás mediante BFS. Las celdas inalcanzables
+        quedan con UNREACHABLE.
+        """
+        distances = array('i', [UNREACHABLE] * self.size)
+        if self.cells[source] == 1:
+            return distances
+
+        distances[source] = 0
+        queue = deque([source])
+        neighbors = self.neighbors
+
+        while queue:
+            cell = queue.popleft()
+            next_distance = distances[cell] + 1
+            for neighbor, _ in neighbors[cell]:
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+
+        return distances
+
+    def cell_of(self, x, y):
+        """Convierte coordenadas (fila, columna) en índice de celda"""
+        return x * self.cols + y
+
+    def position_of(self, cell):
+        """Convierte un índice de celda en coordenadas (fila, columna)"""
+        return divmod(cell, self.cols)
+
+    def is_walkable(self, cell):
+        """Verifica si una celda no es obstáculo"""
+        return self.cells[cell] != 1
@@ -129,12 +129,13 @@ class GameRenderer:
             print(f"  {i}. {step}")
         print()
 
-    def show_heuristic_explanation(self, node, light_positions):
+    def show_heuristic_explanation(self, node, game_state):
         """Muestra el cálculo detallado de la heurística"""
-        lights_off = sum(1 for light in node.lights if light == 0)
+        lights = tuple(game_state.get_light_states(node.mask))
+        lights_off = sum(1 for light in lights if light == 0)
         
         print(f"\n🧮 CÁLCULO DE HEURÍSTICA para posición ({node.x}, {node.y}):")
-        print(f"   Estado de luces: {node.lights}")
+        print(f"   Estado de luces: {lights}")
         print(f"   Luces apagadas: {lights_off}")
         
         if lights_off == 0:
@@ -145,15 +146,18 @@ class GameRenderer:
         min_distance = float('inf')
         closest_light = None
         
-        for i, (lx, ly) in enumerate(light_positions):
-            if node.lights[i] == 0:
-                distance = abs(node.x - lx) + abs(node.y - ly)
-                if distance < min_distance:
+        for i, (lx, ly) in enumerate(game_state.light_positions):
+            if lights[i] == 0:
+                distance = game_state.distance_to_light(node.x, node.y, i)
+                if distance is not None and distance < min_distance:
                     min_distance = distance
                     closest_light = (lx, ly)
         
+        if closest_light is None:
+            min_distance = 0
+        
         print(f"   Luz más cercana: {closest_light}")
-        print(f"   Distancia mínima: {min_distance}")
+        print(f"   Distancia mínima (evitando obstáculos): {min_distance}")
         print(f"   h(n) = {lights_off} + {min_distance} = {lights_off + min_distance}")
         print(f"   g(n) = {node.cost}, f(n) = g(n) + h(n) = {node.cost + lights_off + min_distance}")
         
@@ -168,20 +172,25 @@ class GameRenderer:
         print("A* (Heurística - Algoritmo Informado):")
         print(f"  Nodos explorados: {astar_result['nodes_explored']}")
         print(f"  Pasos solución: {astar_result['steps']}")
-        print(f"  Tiempo: {astar_result['execution_time']:.2f}ms")
+        print(f"  Tiempo: {self.format_time(astar_result)}")
+        self.show_profile(astar_result)
         print()
         print("BFS (Búsqueda Ciega - Sin información):")
         print(f"  Nodos explorados: {bfs_result['nodes_explored']}")
         print(f"  Pasos solución: {bfs_result['steps']}")
-        print(f"  Tiempo: {bfs_result['execution_time']:.2f}ms")
+        print(f"  Tiempo: {self.format_time(bfs_result)}")
+        self.show_profile(bfs_result)
         print()
     
         if astar_result['success'] and bfs_result['success']:
             print("=== ANÁLISIS DE EFICIENCIA ===")
             efficiency_nodes = ((bfs_result['nodes_explored'] - astar_result['nodes_explored']) / bfs_result['nodes_explored']) * 100
         
-            # Evitar división por cero en tiempo
-            if bfs_result['execution_time'] > 0 and astar_result['execution_time'] > 0:
+            # Los resultados cacheados no tienen tiempo; evitar también la división por cero
+            if astar_result['execution_time'] is None or bfs_result['execution_time'] is None:
+                print(f"📈 A* exploró {efficiency_nodes:.1f}% menos nodos que BFS")
+                print("⏱️  Tiempos no comparables: hay resultados de la caché")
+            elif bfs_result['execution_time'] > 0 and astar_result['execution_time'] > 0:
                 efficiency_time = ((bfs_result['execution_time'] - astar_result['execution_time']) / bfs_result['execution_time']) * 100
                 print(f"📈 A* exploró {efficiency_nodes:.1f}% menos nodos que BFS")
                 if efficiency_time > 0:
@@ -202,10 +211,43 @@ class GameRenderer:
         if bfs_result['success']:
             self.show_solution(bfs_result['path'], "BFS")
 
-    def show_visited_path(self, level, visited_nodes, algorithm_name):
+    def format_time(self, result, spec='.2f'):
+        """Tiempo de ejecución formateado, o 'en caché' si el resultado no se midió en esta ejecución"""
+        if result['execution_time'] is None:
+            return "en caché"
+        return f"{result['execution_time']:{spec}}ms"
+
+    def show_unreachable_lights(self, result):
+        """Muestra las luces que no se pueden alcanzar desde el inicio, si las hay"""
+        unreachable = result.get('unreachable_lights')
+        if unreachable:
+            positions = ", ".join(f"({x}, {y})" for x, y in unreachable)
+            print(f"🚫 Luces inalcanzables desde el inicio: {positions}")
+
+    def show_profile(self, result):
+        """Muestra el desglose por fases si la búsqueda se ejecutó con profile=True"""
+        profile = result.get('profile')
+        if not profile:
+            return
+
+        print("  Desglose por fase:")
+        for phase, stats in sorted(profile['phases'].items(), key=lambda item: -item[1]['time_ms']):
+            items = f", {stats['items']} elementos" if 'items' in stats else ""
+            print(f"    {phase:<15} {stats['calls']:>8} llamadas {stats['time_ms']:>9.2f}ms{items}")
+        for counter in ('peak_frontier', 'closed_set_size', 'duplicates'):
+            if counter in profile:
+                print(f"    {counter:<15} {profile[counter]:>8}")
+
+    def show_search_progress(self, snapshot, algorithm_name):
+        """Muestra una línea de progreso de una búsqueda por pasos"""
+        print(f"   🔄 {algorithm_name}: {snapshot['nodes_explored']} nodos, "
+              f"frontera {snapshot['frontier_size']}, f={snapshot['best_f']}, "
+              f"{snapshot['elapsed_ms']:.2f}ms")
+
+    def show_visited_path(self, level, result, algorithm_name):
         """Muestra el recorrido de nodos visitados por el algoritmo"""
         print(f"\n" + "="*60)
-        print(f"🗺️  RECORRIDO DE {algorithm_name} - {len(visited_nodes)} NODOS VISITADOS")
+        print(f"🗺️  RECORRIDO DE {algorithm_name} - {result['nodes_explored']} NODOS VISITADOS")
         print("="*60)
     
         # Crear grid para mostrar el recorrido
@@ -213,29 +255,36 @@ class GameRenderer:
         rows = len(grid)
         cols = len(grid[0])
     
-        # Matriz para almacenar el orden de visita
-        visit_grid = [[0] * cols for _ in range(rows)]
+        # Orden de primera visita de cada celda (traza 'cells'), o reconstruido
+        # desde los nodos si la búsqueda se ejecutó con traza 'full'
+        visited_cells = result.get('visited_cells')
+        if visited_cells is None and result.get('visited_nodes'):
+            visited_cells = [0] * (rows * cols)
+            for node in result['visited_nodes']:
+                if not visited_cells[node.x * cols + node.y]:
+                    visited_cells[node.x * cols + node.y] = node.visited_order
     
-        for node in visited_nodes:
-            if 0 <= node.x < rows and 0 <= node.y < cols:
-                visit_grid[node.x][node.y] = node.visited_order
+        if visited_cells is None:
+            print("(Recorrido no registrado: ejecuta el algoritmo con trace='cells' o 'full')")
+            return
     
-        print("\nOrden de visita en cada celda (0 = no visitado):")
+        print("\nOrden de primera visita en cada celda (0 = no visitado):")
         print("-" * (cols * 4))
     
         for i in range(rows):
             row_display = []
             for j in range(cols):
+                order = visited_cells[i * cols + j]
                 if grid[i][j] == 1:  # Obstáculo
                     row_display.append(" ### ")
-                elif visit_grid[i][j] > 0:
-                    row_display.append(f"{visit_grid[i][j]:>4d}")
+                elif order > 0:
+                    row_display.append(f"{order:>4d}")
                 else:
                     row_display.append("   . ")
             print(" ".join(row_display))
     
         print("-" * (cols * 4))
-        print(f"Total de nodos únicos visitados: {len(set((node.x, node.y) for node in visited_nodes))}")
+        print(f"Total de celdas únicas visitadas: {sum(1 for order in visited_cells if order > 0)}")
 
     def show_algorithm_progress(self, level, result, algorithm_name, show_heuristic=False):
         """Muestra el progreso completo del algoritmo"""
@@ -246,25 +295,26 @@ class GameRenderer:
         if result['success']:
             print(f"✅ ¡Solución encontrada en {result['steps']} pasos!")
             print(f"🔍 Nodos explorados: {result['nodes_explored']}")
-            print(f"⏱️  Tiempo: {result['execution_time']:.2f}ms")
+            print(f"⏱️  Tiempo: {self.format_time(result)}")
             
             # Mostrar información de heurística para A*
             if show_heuristic and 'final_node' in result and result['final_node']:
                 print(f"📐 Valores finales: g={result['final_node'].cost}, h={result['final_node'].heuristic}, f={result['final_node'].total_cost}")
         
             # Mostrar recorrido de visita
-            self.show_visited_path(level, result['visited_nodes'], algorithm_name)
+            self.show_visited_path(level, result, algorithm_name)
         
             # Mostrar camino solución
             print(f"\n🛣️  CAMINO SOLUCIÓN ({algorithm_name}):")
             self.show_solution(result['path'], algorithm_name)
         else:
             print("❌ No se encontró solución")
+            self.show_unreachable_lights(result)
             print(f"🔍 Nodos explorados: {result['nodes_explored']}")
-            print(f"⏱️  Tiempo: {result['execution_time']:.2f}ms")
+            print(f"⏱️  Tiempo: {self.format_time(result)}")
         
             # Mostrar recorrido de visita aunque no haya solución
-            self.show_visited_path(level, result['visited_nodes'], algorithm_name)
+            self.show_visited_path(level, result, algorithm_name)
     
     def evaluate_user_solution(self, level, robot_start, user_path):
         """Evalúa si la solución del usuario es correcta"""
@@ -297,7 +347,7 @@ class GameRenderer:
                 return False, len(user_path)
             
             current_node = next_node
-            print(f"    ✅ Robot en ({current_node.x}, {current_node.y}), luces: {current_node.lights}")
+            print(f"    ✅ Robot en ({current_node.x}, {current_node.y}), luces: {tuple(game_state.get_light_states(current_node.mask))}")
         
         # Verificar si se alcanzó la meta
         is_goal = game_state.is_goal(current_node)
@@ -306,7 +356,7 @@ class GameRenderer:
             print(f"\n🎉 ¡SOLUCIÓN CORRECTA! Todas las luces encendidas en {len(user_path)} pasos")
             return True, len(user_path)
         else:
-            lights_on = sum(current_node.lights)
-            total_lights = len(current_node.lights)
+            lights_on = current_node.mask.bit_count()
+            total_lights = game_state.num_lights
             print(f"\n❌ Solución incompleta. Luces encendidas: {lights_on}/{total_lights}")
             return False, len(user_path)
\ No newline at end of file
@@ -2,24 +2,200 @@
 Clase que maneja el estado del juego y las reglas
 """
 from node import Node
+from compiled_level import CompiledLevel, NO_LIGHT, UNREACHABLE
+from state_graph import StateGraph, MAX_GRAPH_STATES
+
+# Acciones disponibles, indexadas por su código numérico
+ACTIONS = ('ARRIBA', 'ABAJO', 'IZQUIERDA', 'DERECHA', 'ENCENDER')
+TURN_ON = 4
+
+# Reglas de poda por dominancia (ver GameState.__init__); todas preservan la optimalidad
+PRUNING_RULES = ('forced-light-on', 'dead-ends')
+NO_BRANCH = -1
 
 class GameState:
-    def __init__(self, level, robot_x, robot_y):
+    def __init__(self, level, robot_x, robot_y, pruning=()):
+        """
+        pruning: reglas de poda aplicadas al generar sucesores para los
+        algoritmos (get_successors y la validación de jugadas no se podan):
+
+        - 'forced-light-on': sobre una luz apagada el único sucesor es ENCENDER.
+          Cualquier plan óptimo que la encienda más tarde puede encenderla ya,
+          con el mismo largo, porque la máscara no afecta a los movimientos.
+        - 'dead-ends': no entrar en un pasillo o rama sin salida que no tenga
+          luces apagadas. Entrar obliga a volver por la misma celda sin
+          cambiar la máscara, así que quitar ese desvío acorta el camino.
+
+        Cada regla depende solo del estado, por lo que desde cualquier estado
+        sigue existiendo un camino óptimo y las heurísticas siguen siendo
+        admisibles.
+        """
+        for rule in pruning:
+            if rule not in PRUNING_RULES:
+                raise ValueError(f"Regla de poda desconocida: {rule}")
+
         self.level = level
         self.rows = len(level)
         self.cols = len(level[0])
         self.robot_x = robot_x
         self.robot_y = robot_y
-        
-        # Encontrar posiciones de las luces
-        self.light_positions = []
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if level[i][j] == 2:
-                    self.light_positions.append((i, j))
-        
-        # Estado inicial: todas las luces apagadas
-        self.initial_lights = tuple([0] * len(self.light_positions))
+
+        # Nivel precompilado: tablero plano, vecinos por celda y mapa celda -> luz
+        self.compiled = CompiledLevel(level)
+        self.light_index = self.compiled.light_index
+        self.light_positions = [self.compiled.position_of(cell) for cell in self.compiled.light_cells]
+
+        # Estado inicial: todas las luces apagadas (máscara 0)
+        # Un estado se empaqueta como (índice_celda << num_lights) | máscara
+        self.num_lights = len(self.light_positions)
+        self.full_mask = (1 << self.num_lights) - 1
+        self.initial_mask = 0
+
+        # Oráculo de distancias: distancia real desde cada luz a cada celda
+        # (BFS desde cada luz; los movimientos son reversibles)
+        self.light_distances = [self.compiled.distances_from(cell) for cell in self.compiled.light_cells]
+
+        # Luces inalcanzables desde el inicio (posiciones): si hay alguna, el
+        # nivel no tiene solución y los algoritmos fallan sin buscar. Como los
+        # movimientos son reversibles, todo estado alcanzable sigue pudiendo
+        # llegar a las demás luces, así que no hace falta podar durante la búsqueda.
+        start_cell = self.compiled.cell_of(robot_x, robot_y)
+        self.unreachable_lights = [
+            self.light_positions[light]
+            for light, distances in enumerate(self.light_distances)
+            if distances[start_cell] == UNREACHABLE
+        ]
+
+        # Pesos del árbol de expansión mínima por subconjunto de luces (memoizado)
+        self._mst_cache = {}
+
+        # Grafo de estados precalculado (ver precompile_graph)
+        self.state_graph = None
+
+        # Vecinos ya desplazados al formato empaquetado: sucesor = base | máscara
+        shift = self.num_lights
+        self.packed_neighbors = [
+            tuple((neighbor << shift, code) for neighbor, code in moves)
+            for moves in self.compiled.neighbors
+        ]
+
+        # Poda por dominancia: expand() y expand_reverse() pasan a las versiones podadas
+        self.pruning = frozenset(pruning)
+        self.forced_light_on = 'forced-light-on' in self.pruning
+        if 'dead-ends' in self.pruning:
+            self.branch_lights, self.branch_lights_reverse = self._dead_end_branches()
+        else:
+            self.branch_lights = [(NO_BRANCH,) * len(moves) for moves in self.packed_neighbors]
+            self.branch_lights_reverse = self.branch_lights
+        if self.pruning:
+            self.expand = self._expand_pruned
+            self.expand_reverse = self._expand_reverse_pruned
+
+    def _dead_end_branches(self):
+        """
+        Pela repetidamente las celdas caminables con un solo vecino restante:
+        cada celda pelada es la entrada de una rama sin salida colgando de su
+        padre. Retorna dos tablas alineadas con packed_neighbors: la máscara
+        de luces de la rama en la que entra cada movimiento desde la celda, y
+        la del movimiento inverso desde el vecino (NO_BRANCH si no entra en una)
+        """
+        compiled = self.compiled
+        degree = [len(moves) for moves in compiled.neighbors]
+        parent = [None] * compiled.size
+        peeled = [False] * compiled.size
+        leaves = [cell for cell in range(compiled.size) if compiled.is_walkable(cell) and degree[cell] == 1]
+        order = []
+
+        while leaves:
+            cell = leaves.pop()
+            if peeled[cell] or degree[cell] != 1:
+                continue
+            peeled[cell] = True
+            order.append(cell)
+            for neighbor, _ in compiled.neighbors[cell]:
+                if not peeled[neighbor]:
+                    parent[cell] = neighbor
+                    degree[neighbor] -= 1
+                    if degree[neighbor] == 1:
+                        leaves.append(neighbor)
+
+        # Luces de cada rama: las hojas se pelaron antes que sus padres
+        lights = [0] * compiled.size
+        for cell in order:
+            light = self.light_index[cell]
+            if light != NO_LIGHT:
+                lights[cell] |= 1 << light
+            lights[parent[cell]] |= lights[cell]
+
+        forward = [
+            tuple(lights[neighbor] if parent[neighbor] == cell else NO_BRANCH for neighbor, _ in moves)
+            for cell, moves in enumerate(compiled.neighbors)
+        ]
+        reverse = [
+            tuple(lights[cell] if parent[cell] == neighbor else NO_BRANCH for neighbor, _ in moves)
+            for cell, moves in enumerate(compiled.neighbors)
+        ]
+        return forward, reverse
+
+    def pack_state(self, x, y, mask):
+        """Empaqueta posición y máscara de luces en un único entero"""
+        return ((x * self.cols + y) << self.num_lights) | mask
+
+    def unpack_state(self, state):
+        """Desempaqueta un estado y retorna (x, y, máscara)"""
+        x, y = divmod(state >> self.num_lights, self.cols)
+        return x, y, state & self.full_mask
+
+    def get_light_states(self, mask):
+        """Convierte una máscara en la lista de estados de luces (0=apagada, 1=encendida)"""
+        return [(mask >> i) & 1 for i in range(self.num_lights)]
+
+    def distance_to_light(self, x, y, light):
+        """Distancia real desde (x, y) hasta la luz indicada, o None si es inalcanzable"""
+        distance = self.light_distances[light][x * self.cols + y]
+        return None if distance == UNREACHABLE else distance
+
+    def start_states(self):
+        """
+        Estados desde los que arranca una búsqueda: el inicial, o ninguno si
+        hay luces inalcanzables (el nivel no tiene solución y todos los
+        algoritmos fallan de inmediato, sin buscar)
+        """
+        return () if self.unreachable_lights else (self.get_initial_state(),)
+
+    def walk_to_light(self, cell, light):
+        """
+        Retorna los códigos de acción de un camino más corto desde la celda
+        hasta la luz indicada (descendiendo por el oráculo de distancias),
+        o None si la luz es inalcanzable
+        """
+        distances = self.light_distances[light]
+        if distances[cell] == UNREACHABLE:
+            return None
+
+        codes = []
+        while distances[cell] > 0:
+            for neighbor, code in self.compiled.neighbors[cell]:
+                if distances[neighbor] == distances[cell] - 1:
+                    codes.append(code)
+                    cell = neighbor
+                    break
+        return codes
+
+    def light_order_path(self, order):
+        """
+        Convierte un orden de encendido de luces en la lista de acciones:
+        desde el inicio, caminar a cada luz y encenderla
+        """
+        path = []
+        cell = self.compiled.cell_of(self.robot_x, self.robot_y)
+
+        for light in order:
+            path.extend(ACTIONS[code] for code in self.walk_to_light(cell, light))
+            path.append(ACTIONS[TURN_ON])
+            cell = self.compiled.light_cells[light]
+
+        return path
 
     def is_valid_position(self, x, y):
         """Verifica si una posición está dentro del tablero"""
@@ -27,93 +203,241 @@ class GameState:
 
     def can_move_to(self, x, y):
         """Verifica si el robot puede moverse a una posición"""
-        return self.is_valid_position(x, y) and self.level[x][y] != 1
+        return self.is_valid_position(x, y) and self.compiled.cells[x * self.cols + y] != 1
+
+    def get_light_index(self, x, y):
+        """Retorna el índice de la luz en (x, y) o None si no hay luz"""
+        light = self.light_index[x * self.cols + y]
+        return None if light == NO_LIGHT else light
 
-    def can_turn_on_light(self, x, y, lights):
+    def can_turn_on_light(self, x, y, mask):
         """Verifica si el robot puede encender una luz en su posición actual"""
-        # Buscar si hay una luz en esta posición
-        light_index = None
-        for i, (lx, ly) in enumerate(self.light_positions):
-            if lx == x and ly == y:
-                light_index = i
-                break
-        
+        light_index = self.get_light_index(x, y)
+
         # Puede encender si hay una luz y está apagada
-        return light_index is not None and lights[light_index] == 0
+        return light_index is not None and not (mask >> light_index) & 1
+
+    def expand_legal(self, state):
+        """Genera los sucesores de un estado empaquetado como pares (estado, código de acción)"""
+        cell = state >> self.num_lights
+        mask = state & self.full_mask
+
+        # Movimientos legales precalculados para esta celda
+        successors = [(base | mask, code) for base, code in self.packed_neighbors[cell]]
+
+        # Encender la luz de la celda actual si existe y está apagada
+        light = self.light_index[cell]
+        if light != NO_LIGHT and not (mask >> light) & 1:
+            successors.append((state | (1 << light), TURN_ON))
+
+        return successors
+
+    # Sin poda ni grafo precalculado, los algoritmos expanden con todas las jugadas legales
+    expand = expand_legal
+
+    def _expand_pruned(self, state):
+        """expand() con las reglas de poda 'forced-light-on' y 'dead-ends'"""
+        cell = state >> self.num_lights
+        mask = state & self.full_mask
+
+        # Sobre una luz apagada, encenderla domina a cualquier movimiento
+        light = self.light_index[cell]
+        unlit_here = light != NO_LIGHT and not (mask >> light) & 1
+        if unlit_here and self.forced_light_on:
+            return [(state | (1 << light), TURN_ON)]
+
+        # No entrar en ramas sin salida sin luces apagadas
+        unlit = self.full_mask ^ mask
+        successors = [
+            (base | mask, code)
+            for (base, code), branch in zip(self.packed_neighbors[cell], self.branch_lights[cell])
+            if branch == NO_BRANCH or branch & unlit
+        ]
+
+        if unlit_here:
+            successors.append((state | (1 << light), TURN_ON))
+
+        return successors
+
+    def _expand_reverse_pruned(self, state):
+        """expand_reverse() coherente con _expand_pruned: solo predecesores cuyo sucesor podado es este estado"""
+        cell = state >> self.num_lights
+        mask = state & self.full_mask
+        unlit = self.full_mask ^ mask
+        shift = self.num_lights
+        light_index = self.light_index
+
+        predecessors = []
+        for (base, code), branch in zip(self.packed_neighbors[cell], self.branch_lights_reverse[cell]):
+            # Desde una luz apagada con 'forced-light-on' solo se puede encender
+            previous_light = light_index[base >> shift]
+            if self.forced_light_on and previous_light != NO_LIGHT and not (mask >> previous_light) & 1:
+                continue
+
+            # El movimiento previo -> esta celda no puede entrar en una rama sin luces apagadas
+            if branch != NO_BRANCH and not branch & unlit:
+                continue
+
+            predecessors.append((base | mask, code ^ 1))
+
+        light = light_index[cell]
+        if light != NO_LIGHT and (mask >> light) & 1:
+            predecessors.append((state ^ (1 << light), TURN_ON))
+
+        return predecessors
+
+    def precompile_graph(self, max_states=MAX_GRAPH_STATES, time_limit=None):
+        """
+        Enumera una vez el grafo de estados (ver state_graph.py) y reemplaza
+        expand() por una consulta a la tabla de sucesores precalculada.
+        Lanza ValueError si supera max_states y TimeoutError si tarda más
+        de time_limit segundos; en ambos casos expand() no cambia.
+        """
+        if self.state_graph is None:
+            self.state_graph = StateGraph(self, max_states, time_limit)
+            self.expand = self.state_graph.successors
+        return self.state_graph
+
+    def expand_reverse_legal(self, state):
+        """
+        Genera los predecesores de un estado empaquetado como pares
+        (estado previo, código de la acción que lleva del previo a este)
+        """
+        cell = state >> self.num_lights
+        mask = state & self.full_mask
+
+        # Los movimientos son reversibles: el vecino llega aquí con la acción opuesta
+        # (ARRIBA <-> ABAJO, IZQUIERDA <-> DERECHA, es decir código ^ 1)
+        predecessors = [(base | mask, code ^ 1) for base, code in self.packed_neighbors[cell]]
+
+        # Si la luz de esta celda está encendida, pudo encenderse aquí mismo
+        light = self.light_index[cell]
+        if light != NO_LIGHT and (mask >> light) & 1:
+            predecessors.append((state ^ (1 << light), TURN_ON))
+
+        return predecessors
+
+    expand_reverse = expand_reverse_legal
 
     def get_successors(self, node):
-        """Genera todos los sucesores posibles de un nodo"""
+        """Genera todos los sucesores posibles de un nodo (todas las jugadas legales, sin poda)"""
         successors = []
-        directions = [
-            (-1, 0, 'ARRIBA'),
-            (1, 0, 'ABAJO'),
-            (0, -1, 'IZQUIERDA'),
-            (0, 1, 'DERECHA')
-        ]
+        expand = self.expand_legal if self.pruning else self.expand
 
-        # Intentar movimientos en las 4 direcciones
-        for dx, dy, action in directions:
-            new_x = node.x + dx
-            new_y = node.y + dy
-
-            if self.can_move_to(new_x, new_y):
-                successor = Node(
-                    new_x, 
-                    new_y, 
-                    list(node.lights), 
-                    node, 
-                    action, 
-                    node.cost + 1
-                )
-                successors.append(successor)
-
-        # Intentar encender luz en la posición actual
-        if self.can_turn_on_light(node.x, node.y, node.lights):
-            light_index = None
-            for i, (lx, ly) in enumerate(self.light_positions):
-                if lx == node.x and ly == node.y:
-                    light_index = i
-                    break
-            
-            new_lights = list(node.lights)
-            new_lights[light_index] = 1
-
-            successor = Node(
-                node.x, 
-                node.y, 
-                new_lights, 
-                node, 
-                'ENCENDER', 
-                node.cost + 1
-            )
-            successors.append(successor)
+        for state, code in expand(node.state):
+            x, y, mask = self.unpack_state(state)
+            successors.append(Node(x, y, mask, state, node, ACTIONS[code], node.cost + 1))
 
         return successors
 
     def is_goal(self, node):
         """Verifica si un nodo representa el estado meta (todas las luces encendidas)"""
-        return all(light == 1 for light in node.lights)
+        return node.mask == self.full_mask
+
+    def is_goal_state(self, state):
+        """Verifica si un estado empaquetado tiene todas las luces encendidas"""
+        return state & self.full_mask == self.full_mask
+
+    def get_goal_states(self):
+        """Retorna todos los estados meta: cualquier celda caminable con todas las luces encendidas"""
+        shift = self.num_lights
+        return [
+            (cell << shift) | self.full_mask
+            for cell in range(self.compiled.size)
+            if self.compiled.is_walkable(cell)
+        ]
 
     def heuristic(self, node):
         """
         Calcula la heurística para A*
-        Heurística = número de luces apagadas + distancia a la luz más cercana
+        Heurística = número de luces apagadas + distancia real a la luz apagada más cercana
         """
-        lights_off = sum(1 for light in node.lights if light == 0)
-        
+        return self.state_heuristic(node.state)
+
+    def state_heuristic(self, state):
+        """Calcula la heurística de un estado empaquetado"""
+        cell = state >> self.num_lights
+        mask = state & self.full_mask
+        lights_off = self.num_lights - mask.bit_count()
+
         if lights_off == 0:
             return 0
 
-        # Encontrar distancia a la luz apagada más cercana
-        min_distance = float('inf')
-        
-        for i, (lx, ly) in enumerate(self.light_positions):
-            if node.lights[i] == 0:
-                distance = abs(node.x - lx) + abs(node.y - ly)
-                min_distance = min(min_distance, distance)
+        return lights_off + self._nearest_unlit_distance(cell, self.full_mask ^ mask)
+
+    def mst_heuristic(self, state):
+        """
+        Heurística MST (más fuerte, también admisible):
+        h = luces apagadas + distancia a la luz apagada más cercana
+            + peso del árbol de expansión mínima sobre las luces apagadas
+
+        Cualquier recorrido que encienda las luces restantes llega primero a
+        alguna de ellas y luego las conecta a todas, por lo que nunca cuesta
+        menos que esa distancia más el MST.
+        """
+        cell = state >> self.num_lights
+        unlit = self.full_mask ^ (state & self.full_mask)
+
+        if unlit == 0:
+            return 0
+
+        return unlit.bit_count() + self._nearest_unlit_distance(cell, unlit) + self.mst_weight(unlit)
+
+    def _nearest_unlit_distance(self, cell, unlit):
+        """Distancia real (evitando obstáculos) desde la celda a la luz apagada más cercana, o 0"""
+        min_distance = None
+
+        for i, distances in enumerate(self.light_distances):
+            if (unlit >> i) & 1:
+                distance = distances[cell]
+                if distance != UNREACHABLE and (min_distance is None or distance < min_distance):
+                    min_distance = distance
+
+        return min_distance or 0
+
+    def mst_weight(self, lights_mask):
+        """Peso del MST (distancias reales) sobre las luces del subconjunto, memoizado"""
+        weight = self._mst_cache.get(lights_mask)
+        if weight is None:
+            weight = self._compute_mst_weight(lights_mask)
+            self._mst_cache[lights_mask] = weight
+        return weight
+
+    def _compute_mst_weight(self, lights_mask):
+        """Algoritmo de Prim sobre las luces del subconjunto"""
+        lights = [i for i in range(self.num_lights) if (lights_mask >> i) & 1]
+        light_cells = self.compiled.light_cells
+
+        # Distancia de cada luz fuera del árbol al árbol actual
+        best = {light: None for light in lights[1:]}
+        tree_light = lights[0]
+        weight = 0
+
+        while best:
+            distances = self.light_distances[tree_light]
+            for light in best:
+                distance = distances[light_cells[light]]
+                if distance != UNREACHABLE and (best[light] is None or distance < best[light]):
+                    best[light] = distance
+
+            # Las luces inalcanzables entre sí no aportan peso (cota inferior)
+            tree_light = min(best, key=lambda light: float('inf') if best[light] is None else best[light])
+            weight += best.pop(tree_light) or 0
+
+        return weight
+
+    def get_heuristic(self, name='nearest'):
+        """Retorna la función heurística sobre estados empaquetados por nombre"""
+        if name == 'nearest':
+            return self.state_heuristic
+        if name == 'mst':
+            return self.mst_heuristic
+        raise ValueError(f"Heurística desconocida: {name}")
 
-        return lights_off + min_distance
+    def get_initial_state(self):
+        """Retorna el estado inicial empaquetado"""
+        return self.pack_state(self.robot_x, self.robot_y, self.initial_mask)
 
     def get_initial_node(self):
         """Crea el nodo inicial"""
-        return Node(self.robot_x, self.robot_y, list(self.initial_lights))
\ No newline at end of file
+        return Node(self.robot_x, self.robot_y, self.initial_mask, self.get_initial_state())
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Implementación exacta por programación dinámica sobre subconjuntos de luces (Held-Karp)
+
+Con las distancias reales entre luces ya calculadas, el problema es un
+TSP abierto sobre las luces más un ENCENDER por luz:
+
+    dp[subconjunto][i] = costo mínimo para dejar encendido el subconjunto
+                         terminando sobre la luz i (recién encendida)
+
+El costo depende del número de luces (O(2^n * n^2)), no del área del tablero.
+"""
+import time
+from array import array
+from search_result import make_result
+
+INFINITY = 2 ** 31 - 1
+
+class HeldKarp:
+    def __init__(self, game_state, time_limit=None):
+        """
+        time_limit: segundos máximos (None = sin límite), revisados por
+        subconjunto; al vencer el resultado tiene timed_out=True
+        """
+        self.game_state = game_state
+        self.time_limit = time_limit
+        self.timed_out = False
+        self.nodes_explored = 0
+        self.visited_nodes = []
+
+    def solve(self):
+        """Ejecuta la programación dinámica y expande el recorrido a movimientos"""
+        self.nodes_explored = 0
+        self.timed_out = False
+        start_time = time.perf_counter()
+        deadline = None if self.time_limit is None else start_time + self.time_limit
+
+        game_state = self.game_state
+        num_lights = game_state.num_lights
+        light_cells = game_state.compiled.light_cells
+        start_cell = game_state.compiled.cell_of(game_state.robot_x, game_state.robot_y)
+
+        if num_lights == 0:
+            return self._result(True, [], start_time)
+
+        # Distancias desde el inicio y entre cada par de luces
+        if not game_state.start_states():
+            return self._result(False, [], start_time)
+        start_distances = [distances[start_cell] for distances in game_state.light_distances]
+
+        pair_distances = [
+            [game_state.light_distances[j][light_cells[i]] for j in range(num_lights)]
+            for i in range(num_lights)
+        ]
+
+        # Tablas planas indexadas por subconjunto * num_lights + luz final
+        size = (1 << num_lights) * num_lights
+        cost = array('i', [INFINITY]) * size
+        previous = array('b', [-1]) * size
+
+        for light in range(num_lights):
+            cost[(1 << light) * num_lights + light] = start_distances[light] + 1
+
+        full_mask = game_state.full_mask
+        for mask in range(1, full_mask + 1):
+            if deadline is not None and time.perf_counter() > deadline:
+                self.timed_out = True
+                return self._result(False, [], start_time)
+
+            base = mask * num_lights
+            for last in range(num_lights):
+                current_cost = cost[base + last]
+                if current_cost == INFINITY:
+                    continue
+
+                self.nodes_explored += 1
+                distances = pair_distances[last]
+                for light in range(num_lights):
+                    if (mask >> light) & 1:
+                        continue
+
+                    index = (mask | (1 << light)) * num_lights + light
+                    new_cost = current_cost + distances[light] + 1
+                    if new_cost < cost[index]:
+                        cost[index] = new_cost
+                        previous[index] = last
+
+        # Mejor luz final con todas las luces encendidas
+        base = full_mask * num_lights
+        last = min(range(num_lights), key=lambda light: cost[base + light])
+
+        # Reconstruir el orden de las luces hacia atrás
+        order = []
+        mask = full_mask
+        while last != -1:
+            order.append(last)
+            before = previous[mask * num_lights + last]
+            mask ^= 1 << last
+            last = before
+        order.reverse()
+
+        return self._result(True, game_state.light_order_path(order), start_time)
+
+    def _result(self, success, path, start_time):
+        """Construye el resultado (sin nodo final: la búsqueda no recorre estados del tablero)"""
+        return make_result(self.game_state, success, path, self.nodes_explored,
+                           (time.perf_counter() - start_time) * 1000, visited_nodes=self.visited_nodes,
+                           timed_out=self.timed_out)
\ No newline at end of file
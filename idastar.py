@@ -0,0 +1,141 @@
+"""
+Implementación del algoritmo IDA* (A* con profundización iterativa)
+
+Usa memoria lineal en la profundidad de la solución: solo guarda el camino
+actual. Opcionalmente mantiene una tabla de transposición pequeña (estado ->
+mejor g visto en la iteración) para limitar las re-expansiones.
+"""
+import time
+from game_state import ACTIONS
+from search_result import make_result
+
+# Cada cuántos nodos se revisa el tiempo límite (potencia de 2 menos 1, como máscara)
+DEADLINE_CHECK_MASK = 1023
+
+class IDAStar:
+    def __init__(self, game_state, heuristic='nearest', transposition_size=0, time_limit=None):
+        """
+        heuristic: 'nearest' o 'mst' (ver GameState.get_heuristic)
+        transposition_size: máximo de entradas de la tabla de transposición (0 = sin tabla)
+        time_limit: segundos máximos de búsqueda (None = sin límite); al vencer
+        el resultado tiene success=False y timed_out=True
+        """
+        self.game_state = game_state
+        self.heuristic = game_state.get_heuristic(heuristic)
+        self.transposition_size = transposition_size
+        self.time_limit = time_limit
+        self.timed_out = False
+        self.nodes_explored = 0
+        self.visited_nodes = []
+        self.iterations = []
+
+    def solve(self):
+        """Ejecuta IDA* aumentando el umbral de f hasta encontrar la solución"""
+        self.nodes_explored = 0
+        self.iterations = []
+        self.timed_out = False
+        start_time = time.perf_counter()
+        self.deadline = None if self.time_limit is None else start_time + self.time_limit
+
+        if not self.game_state.start_states():
+            return self._result(False, [], start_time)
+
+        initial_state = self.game_state.get_initial_state()
+        threshold = self.heuristic(initial_state)
+
+        while True:
+            nodes_before = self.nodes_explored
+            path, next_threshold = self._search(initial_state, threshold)
+            self.iterations.append({
+                'threshold': threshold,
+                'nodes_explored': self.nodes_explored - nodes_before
+            })
+
+            if path is not None:
+                return self._result(True, path, start_time)
+
+            if self.timed_out:
+                return self._result(False, [], start_time)
+
+            # Sin nodos podados: se agotó el espacio alcanzable
+            if next_threshold is None:
+                return self._result(False, [], start_time)
+
+            threshold = next_threshold
+
+    def _search(self, initial_state, threshold):
+        """
+        Búsqueda en profundidad acotada por f <= umbral, con pila explícita.
+        Retorna (camino o None, menor f que superó el umbral o None)
+        """
+        game_state = self.game_state
+        heuristic_fn = self.heuristic
+        expand = game_state.expand
+        is_goal_state = game_state.is_goal_state
+        deadline = self.deadline
+        perf_counter = time.perf_counter
+
+        if is_goal_state(initial_state):
+            return [], None
+
+        table = {} if self.transposition_size > 0 else None
+        table_limit = self.transposition_size
+        next_threshold = None
+
+        # Camino actual: estados en la pila, acciones tomadas y conjunto para evitar ciclos
+        self.nodes_explored += 1
+        stack = [(0, iter(expand(initial_state)))]
+        states = [initial_state]
+        on_path = {initial_state}
+        actions = []
+
+        while stack:
+            cost, successors = stack[-1]
+            successor_cost = cost + 1
+            advanced = False
+
+            for successor_state, action in successors:
+                if successor_state in on_path:
+                    continue
+
+                total_cost = successor_cost + heuristic_fn(successor_state)
+                if total_cost > threshold:
+                    if next_threshold is None or total_cost < next_threshold:
+                        next_threshold = total_cost
+                    continue
+
+                if table is not None:
+                    best_cost = table.get(successor_state)
+                    if best_cost is not None and best_cost <= successor_cost:
+                        continue
+                    if best_cost is not None or len(table) < table_limit:
+                        table[successor_state] = successor_cost
+
+                actions.append(action)
+                if is_goal_state(successor_state):
+                    return [ACTIONS[code] for code in actions], None
+
+                # Descender al sucesor
+                self.nodes_explored += 1
+                if deadline is not None and not self.nodes_explored & DEADLINE_CHECK_MASK and perf_counter() > deadline:
+                    self.timed_out = True
+                    return None, None
+                stack.append((successor_cost, iter(expand(successor_state))))
+                states.append(successor_state)
+                on_path.add(successor_state)
+                advanced = True
+                break
+
+            if not advanced:
+                stack.pop()
+                on_path.discard(states.pop())
+                if actions:
+                    actions.pop()
+
+        return None, next_threshold
+
+    def _result(self, success, path, start_time):
+        """Construye el resultado con las iteraciones realizadas"""
+        return make_result(self.game_state, success, path, self.nodes_explored,
+                           (time.perf_counter() - start_time) * 1000, visited_nodes=self.visited_nodes,
+                           iterations=self.iterations, timed_out=self.timed_out)
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+BFS vectorizada por capas sobre arreglos de NumPy (opcional)
+
+Cada capa de la frontera es un arreglo de estados empaquetados
+(celda << num_lights | máscara). Una capa completa se expande de una vez
+con la tabla de vecinos precalculada, los duplicados se descartan contra
+un mapa de bits de visitados indexado por el propio estado, y cada capa
+guarda el índice del padre en la capa anterior para reconstruir el camino.
+
+Requiere NumPy; si no está instalado, LayerBFS lanza ImportError al crearse.
+"""
+import time
+from node import Node
+from game_state import ACTIONS, TURN_ON
+from compiled_level import NO_LIGHT
+from search_result import make_result
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tamaño máximo del mapa de bits de visitados (un byte por estado posible)
+MAX_STATES = 1 << 27
+
+class LayerBFS:
+    def __init__(self, game_state, max_states=MAX_STATES, time_limit=None):
+        """
+        max_states: tamaño máximo del mapa de bits de visitados
+        time_limit: segundos máximos (None = sin límite), revisados por capa;
+        al vencer el resultado tiene timed_out=True
+        """
+        if np is None:
+            raise ImportError("LayerBFS requiere NumPy (pip install numpy)")
+
+        self.game_state = game_state
+        self.time_limit = time_limit
+        self.timed_out = False
+        self.nodes_explored = 0
+        self.visited_nodes = []
+
+        compiled = game_state.compiled
+        self.shift = game_state.num_lights
+        self.state_space = compiled.size << self.shift
+        if self.state_space > max_states:
+            raise ValueError(f"Espacio de estados demasiado grande para LayerBFS: {self.state_space} estados")
+
+        # Tabla de vecinos: neighbor_table[celda, código] = celda destino o -1
+        self.neighbor_table = np.full((compiled.size, 4), -1, dtype=np.int64)
+        for cell, moves in enumerate(compiled.neighbors):
+            for neighbor, code in moves:
+                self.neighbor_table[cell, code] = neighbor
+
+        # Bit de la luz de cada celda (0 si no hay luz)
+        self.light_bits = np.array(
+            [0 if light == NO_LIGHT else 1 << light for light in compiled.light_index], dtype=np.int64)
+
+    def solve(self):
+        """Ejecuta la BFS por capas para encontrar la solución"""
+        start_time = time.perf_counter()
+        deadline = None if self.time_limit is None else start_time + self.time_limit
+        self.nodes_explored = 0
+        self.timed_out = False
+
+        game_state = self.game_state
+        shift = self.shift
+        full_mask = game_state.full_mask
+
+        initial_state = game_state.get_initial_state()
+        visited = np.zeros(self.state_space, dtype=bool)
+        visited[initial_state] = True
+
+        # Por capa: (estados, índice del padre en la capa anterior, código de acción)
+        frontier = np.array(game_state.start_states(), dtype=np.int64)
+        layers = [(frontier, None, None)]
+
+        while len(frontier):
+            goals = np.flatnonzero((frontier & full_mask) == full_mask)
+            if len(goals):
+                self.nodes_explored += int(goals[0]) + 1
+                return self._result(True, layers, int(goals[0]), start_time)
+
+            if deadline is not None and time.perf_counter() > deadline:
+                self.timed_out = True
+                break
+
+            self.nodes_explored += len(frontier)
+            cells = frontier >> shift
+            masks = frontier & full_mask
+            positions = np.arange(len(frontier), dtype=np.int64)
+
+            candidates = []
+            parents = []
+            actions = []
+
+            # Movimientos: una columna de la tabla de vecinos por código
+            for code in range(4):
+                targets = self.neighbor_table[cells, code]
+                legal = targets >= 0
+                candidates.append((targets[legal] << shift) | masks[legal])
+                parents.append(positions[legal])
+                actions.append(np.full(int(legal.sum()), code, dtype=np.int8))
+
+            # Encender la luz de la celda si existe y está apagada
+            bits = self.light_bits[cells]
+            legal = (bits != 0) & ((masks & bits) == 0)
+            candidates.append(frontier[legal] | bits[legal])
+            parents.append(positions[legal])
+            actions.append(np.full(int(legal.sum()), TURN_ON, dtype=np.int8))
+
+            candidates = np.concatenate(candidates)
+            parents = np.concatenate(parents)
+            actions = np.concatenate(actions)
+
+            # Descartar visitados y quedarse con la primera aparición de cada estado
+            fresh = ~visited[candidates]
+            candidates, first = np.unique(candidates[fresh], return_index=True)
+            parents = parents[fresh][first]
+            actions = actions[fresh][first]
+            visited[candidates] = True
+
+            frontier = candidates
+            layers.append((frontier, parents, actions))
+
+        return self._result(False, layers, None, start_time)
+
+    def _result(self, success, layers, goal_position, start_time):
+        """Construye el diccionario de resultado reconstruyendo el camino capa por capa"""
+        path = []
+        final_node = None
+
+        if success:
+            position = goal_position
+            for _, parents, actions in reversed(layers[1:]):
+                path.append(ACTIONS[int(actions[position])])
+                position = int(parents[position])
+            path.reverse()
+
+            final_state = int(layers[-1][0][goal_position])
+            x, y, mask = self.game_state.unpack_state(final_state)
+            final_node = Node(x, y, mask, final_state, cost=len(path))
+            final_node.total_cost = len(path)
+            final_node.visited_order = self.nodes_explored
+
+        return make_result(self.game_state, success, path, self.nodes_explored,
+                           (time.perf_counter() - start_time) * 1000, final_node,
+                           layers=len(layers), timed_out=self.timed_out, visited_cells=None)
\ No newline at end of file
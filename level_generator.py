@@ -0,0 +1,163 @@
+"""
+Generador procedural de niveles con semilla
+
+Produce niveles resolubles con la misma forma que levels.py
+({'grid', 'robot_start', 'name', 'description'}) y tamaño, densidad de
+obstáculos y número de luces configurables, para poner a prueba los
+solucionadores a mayor escala.
+
+Estilos:
+- 'open': campo abierto con obstáculos aleatorios según la densidad
+- 'maze': laberinto (backtracking recursivo) al que se le quitan muros
+  entre pasillos hasta bajar a la densidad pedida (nunca se añaden)
+
+Todas las celdas libres quedan conectadas con el inicio, así que todas las
+luces son alcanzables.
+"""
+import argparse
+import json
+import random
+
+from compiled_level import CompiledLevel, MOVES, UNREACHABLE
+
+STYLES = ('open', 'maze')
+MAX_ATTEMPTS = 100
+
+def generate_level(rows, cols, lights, density=0.25, style='open', seed=None, name=None):
+    """Genera un nivel resoluble; la misma semilla produce siempre el mismo nivel"""
+    if style not in STYLES:
+        raise ValueError(f"Estilo desconocido: {style}")
+    if rows < 1 or cols < 1 or lights < 1:
+        raise ValueError(f"Dimensiones o número de luces inválidos: {rows}x{cols}, {lights} luces")
+    if not 0 <= density < 1:
+        raise ValueError(f"Densidad inválida: {density}")
+
+    rng = random.Random(seed)
+    carve = _carve_open if style == 'open' else _carve_maze
+
+    for _ in range(MAX_ATTEMPTS):
+        grid = carve(rng, rows, cols, density)
+        start = _connect_from_start(rng, grid)
+        if start is None:
+            continue
+
+        # Las luces van en celdas libres (ya conectadas) distintas del inicio
+        floor = [(x, y) for x in range(rows) for y in range(cols) if grid[x][y] == 0 and (x, y) != start]
+        if len(floor) < lights:
+            continue
+        for x, y in rng.sample(floor, lights):
+            grid[x][y] = 2
+
+        return {
+            'grid': grid,
+            'robot_start': start,
+            'name': name or f"Nivel generado {rows}x{cols}",
+            'description': f"{lights} luces, estilo {style}, densidad {density:.2f}, semilla {seed}"
+        }
+
+    raise ValueError(f"No se pudo generar un nivel {rows}x{cols} con {lights} luces y densidad {density}")
+
+def generate_levels(count, rows, cols, lights, density=0.25, style='open', seed=0):
+    """Genera un paquete de niveles numerados desde 1, como LEVELS en levels.py"""
+    return {
+        number: generate_level(rows, cols, lights, density, style, seed=f"{seed}-{number}",
+                               name=f"Nivel generado {number}")
+        for number in range(1, count + 1)
+    }
+
+def _carve_open(rng, rows, cols, density):
+    """Campo abierto: cada celda es obstáculo con probabilidad igual a la densidad"""
+    return [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+
+def _carve_maze(rng, rows, cols, density):
+    """Laberinto perfecto sobre las celdas pares, abierto luego hasta la densidad pedida"""
+    grid = [[1] * cols for _ in range(rows)]
+    grid[0][0] = 0
+    stack = [(0, 0)]
+
+    # Backtracking recursivo (con pila explícita) saltando de dos en dos
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + 2 * dx, y + 2 * dy, dx, dy) for dx, dy in MOVES
+            if 0 <= x + 2 * dx < rows and 0 <= y + 2 * dy < cols and grid[x + 2 * dx][y + 2 * dy] == 1
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        grid[x + dx][y + dy] = 0
+        grid[nx][ny] = 0
+        stack.append((nx, ny))
+
+    # Quitar muros que separan dos pasillos crea ciclos sin aislar zonas
+    walls = [
+        (x, y) for x in range(rows) for y in range(cols)
+        if grid[x][y] == 1 and _separates_passages(grid, x, y)
+    ]
+    rng.shuffle(walls)
+    excess = sum(row.count(1) for row in grid) - int(density * rows * cols)
+    for x, y in walls[:max(excess, 0)]:
+        grid[x][y] = 0
+
+    return grid
+
+def _separates_passages(grid, x, y):
+    """Verifica si un muro está entre dos pasillos opuestos (horizontal o vertical)"""
+    rows, cols = len(grid), len(grid[0])
+    vertical = 0 < x < rows - 1 and grid[x - 1][y] == 0 and grid[x + 1][y] == 0
+    horizontal = 0 < y < cols - 1 and grid[x][y - 1] == 0 and grid[x][y + 1] == 0
+    return vertical or horizontal
+
+def _connect_from_start(rng, grid):
+    """
+    Elige una celda de inicio en la mayor región libre conectada y convierte
+    en obstáculo toda celda libre fuera de ella. Retorna la posición inicial o None.
+    """
+    cols = len(grid[0])
+    compiled = CompiledLevel(grid)
+    free = [(x, y) for x, row in enumerate(grid) for y, cell in enumerate(row) if cell == 0]
+
+    # Separar las celdas libres en regiones conectadas
+    regions = []
+    pending = set(free)
+    while pending:
+        x, y = min(pending)
+        distances = compiled.distances_from(x * cols + y)
+        region = [(x, y) for x, y in pending if distances[x * cols + y] != UNREACHABLE]
+        pending.difference_update(region)
+        regions.append(sorted(region))
+
+    if not regions:
+        return None
+
+    largest = max(regions, key=len)
+    for region in regions:
+        if region is not largest:
+            for x, y in region:
+                grid[x][y] = 1
+    return rng.choice(largest)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador procedural de niveles LightBot")
+    parser.add_argument('--count', type=int, default=10, help="Número de niveles")
+    parser.add_argument('--rows', type=int, default=10)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--lights', type=int, default=5)
+    parser.add_argument('--density', type=float, default=0.25, help="Fracción de obstáculos")
+    parser.add_argument('--style', choices=STYLES, default='open')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Archivo JSON de salida (por defecto, salida estándar)")
+    args = parser.parse_args()
+
+    levels = generate_levels(args.count, args.rows, args.cols, args.lights, args.density, args.style, args.seed)
+    data = json.dumps(levels, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
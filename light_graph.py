@@ -0,0 +1,131 @@
+"""
+Solucionador abstracto sobre el grafo de luces (macro-acciones)
+
+En lugar de caminar celda por celda en cada capa de máscaras, busca solo
+sobre macro-acciones "ir a la luz i y encenderla", cuyo costo es la
+distancia real hasta la luz más un ENCENDER. Pasar por encima de una luz
+no la enciende, así que la abstracción es exacta.
+
+La búsqueda es A* sobre estados (última luz encendida, subconjunto
+encendido) con la heurística MST de GameState (distancia a la luz apagada
+más cercana + MST sobre las apagadas + un ENCENDER por luz), que es
+admisible. A diferencia de Held-Karp no recorre todos los subconjuntos:
+solo los que la heurística no descarta. El recorrido elegido se expande
+al final a la lista de acciones ARRIBA/ABAJO/.../ENCENDER.
+"""
+import time
+from node import Node
+from priority_queue import PriorityQueue
+from search_result import make_result
+
+# Posición de la macro-búsqueda antes de encender la primera luz
+START = -1
+
+class LightGraphSolver:
+    def __init__(self, game_state, time_limit=None):
+        """
+        time_limit: segundos máximos (None = sin límite), revisados en cada
+        macro-estado expandido; al vencer el resultado tiene timed_out=True
+        """
+        self.game_state = game_state
+        self.time_limit = time_limit
+        self.timed_out = False
+        self.nodes_explored = 0
+        self.visited_nodes = []
+
+    def solve(self):
+        """Ejecuta A* sobre las macro-acciones y expande el recorrido a movimientos"""
+        self.nodes_explored = 0
+        self.timed_out = False
+        start_time = time.perf_counter()
+        deadline = None if self.time_limit is None else start_time + self.time_limit
+
+        game_state = self.game_state
+        num_lights = game_state.num_lights
+        full_mask = game_state.full_mask
+        light_cells = game_state.compiled.light_cells
+        start_cell = game_state.compiled.cell_of(game_state.robot_x, game_state.robot_y)
+
+        # Distancias desde el inicio (fila START) y entre cada par de luces
+        if not game_state.start_states():
+            return self._result(False, [], None, start_time)
+        start_distances = [distances[start_cell] for distances in game_state.light_distances]
+
+        distances_from = {START: start_distances}
+        for i, cell in enumerate(light_cells):
+            distances_from[i] = [distances[cell] for distances in game_state.light_distances]
+
+        def heuristic(position, mask):
+            unlit = full_mask ^ mask
+            if unlit == 0:
+                return 0
+            distances = distances_from[position]
+            nearest = min(distances[light] for light in range(num_lights) if (unlit >> light) & 1)
+            return unlit.bit_count() + nearest + game_state.mst_weight(unlit)
+
+        # Macro-estado (posición, máscara) -> mejor costo y predecesor
+        initial = (START, 0)
+        best_cost = {initial: 0}
+        previous = {initial: None}
+        open_set = PriorityQueue()
+        open_set.enqueue((initial, 0), heuristic(START, 0))
+
+        while not open_set.is_empty():
+            current, current_cost = open_set.dequeue()
+            if current_cost > best_cost[current]:
+                continue
+
+            if deadline is not None and time.perf_counter() > deadline:
+                self.timed_out = True
+                return self._result(False, [], None, start_time)
+
+            position, mask = current
+            self.nodes_explored += 1
+            if mask == full_mask:
+                order = self._light_order(previous, current)
+                return self._result(True, game_state.light_order_path(order), current, start_time)
+
+            # Macro-acción: caminar hasta una luz apagada y encenderla
+            distances = distances_from[position]
+            for light in range(num_lights):
+                if (mask >> light) & 1:
+                    continue
+
+                successor = (light, mask | (1 << light))
+                successor_cost = current_cost + distances[light] + 1
+                known_cost = best_cost.get(successor)
+                if known_cost is not None and known_cost <= successor_cost:
+                    continue
+
+                best_cost[successor] = successor_cost
+                previous[successor] = current
+                open_set.enqueue((successor, successor_cost), successor_cost + heuristic(light, successor[1]))
+
+        return self._result(False, [], None, start_time)
+
+    def _light_order(self, previous, final):
+        """Reconstruye el orden de encendido de las luces hasta el macro-estado final"""
+        order = []
+        current = final
+        while previous[current] is not None:
+            order.append(current[0])
+            current = previous[current]
+        order.reverse()
+        return order
+
+    def _result(self, success, path, final, start_time):
+        """Construye el resultado; el nodo final se ubica sobre la última luz encendida"""
+        final_node = None
+        if success:
+            game_state = self.game_state
+            if final[0] == START:
+                x, y = game_state.robot_x, game_state.robot_y
+            else:
+                x, y = game_state.compiled.position_of(game_state.compiled.light_cells[final[0]])
+            final_node = Node(x, y, final[1], game_state.pack_state(x, y, final[1]), cost=len(path))
+            final_node.total_cost = len(path)
+            final_node.visited_order = self.nodes_explored
+
+        return make_result(self.game_state, success, path, self.nodes_explored,
+                           (time.perf_counter() - start_time) * 1000, final_node,
+                           visited_nodes=self.visited_nodes, timed_out=self.timed_out)
\ No newline at end of file
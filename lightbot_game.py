@@ -1,18 +1,24 @@
 """
 Juego LightBot - Comparación A* vs BFS
 """
+import os
 from game_state import GameState
 from game_state import GameState
 from game_renderer import GameRenderer
 from astar import AStar
 from bfs import BFS
 from levels import get_level
+from solution_cache import SolutionCache
+from batch_solver import BatchSolver, aggregate, solve_job
+
+CACHE_FILE = 'lightbot_cache.sqlite'
 
 class LightBotGame:
     def __init__(self):
         self.renderer = GameRenderer()
         self.current_level = None
         self.game_state = None
+        self.solution_cache = SolutionCache(CACHE_FILE)
 
     def play(self):
         """Inicia el juego principal"""
@@ -37,6 +43,7 @@ class LightBotGame:
                 self._generate_readme()
             elif choice == '7':
                 print("¡Gracias por jugar!")
+                self.solution_cache.close()
                 break
             else:
                 print("Opción inválida. Intenta de nuevo.")
@@ -69,15 +76,16 @@ class LightBotGame:
         
         # Mostrar explicación de la heurística
         initial_node = self.game_state.get_initial_node()
-        self.renderer.show_heuristic_explanation(initial_node, self.game_state.light_positions)
+        self.renderer.show_heuristic_explanation(initial_node, self.game_state)
     
         input("\nPresiona ENTER para ver la solución con A*...")
     
         print("\n" + "="*60)
         print("🔍 RESOLVIENDO CON A* (ALGORITMO INFORMADO)")
         print("="*60)
-        astar_solver = AStar(self.game_state)
-        astar_result = astar_solver.solve()
+        astar_solver = AStar(self.game_state, trace='cells')
+        astar_result = self._solve_cached(
+            self.game_state, 'astar:cells', lambda: self._solve_with_progress(astar_solver, "A*"))
     
         # Mostrar progreso detallado de A*
         self.renderer.show_algorithm_progress(level, astar_result, "A*", show_heuristic=True)
@@ -87,8 +95,9 @@ class LightBotGame:
         print("\n" + "="*60)
         print("🔍 RESOLVIENDO CON BFS (BÚSQUEDA CIEGA)")
         print("="*60)
-        bfs_solver = BFS(self.game_state)
-        bfs_result = bfs_solver.solve()
+        bfs_solver = BFS(self.game_state, trace='cells')
+        bfs_result = self._solve_cached(
+            self.game_state, 'bfs:cells', lambda: self._solve_with_progress(bfs_solver, "BFS"))
     
         # Mostrar progreso detallado de BFS
         self.renderer.show_algorithm_progress(level, bfs_result, "BFS")
@@ -98,6 +107,20 @@ class LightBotGame:
         # Mostrar comparación
         self.renderer.show_stats(astar_result, bfs_result)
 
+    def _solve_with_progress(self, solver, algorithm_name, batch_size=100):
+        """Ejecuta un algoritmo por pasos mostrando su progreso mientras busca"""
+        for snapshot in solver.steps(batch_size):
+            if snapshot['done']:
+                return snapshot['result']
+            self.renderer.show_search_progress(snapshot, algorithm_name)
+
+    def _solve_cached(self, game_state, algorithm, solve_fn, path_only=False):
+        """
+        Consulta la caché de soluciones antes de ejecutar el algoritmo
+        (path_only=True: basta el camino guardado para otra simetría del nivel)
+        """
+        return self.solution_cache.get_or_solve(game_state, algorithm, solve_fn, path_only)
+
     def _user_guess_mode(self):
         """Modo donde el usuario adivina la solución antes de ver los algoritmos"""
         print("\n🎮 MODO ADIVINANZA - Ingresa tu solución")
@@ -156,10 +179,10 @@ class LightBotGame:
         game_state = GameState(level['grid'], robot_x, robot_y)
         
         astar_solver = AStar(game_state)
-        astar_result = astar_solver.solve()
+        astar_result = self._solve_cached(game_state, 'astar', astar_solver.solve)
         
         bfs_solver = BFS(game_state)
-        bfs_result = bfs_solver.solve()
+        bfs_result = self._solve_cached(game_state, 'bfs', bfs_solver.solve)
         
         # Mostrar comparación incluyendo solución del usuario
         print("\n" + "="*60)
@@ -187,62 +210,123 @@ class LightBotGame:
         print("\n🔍 COMPARACIÓN COMPLETA DE TODOS LOS NIVELES")
         print("=" * 60)
         
-        total_astar_nodes = 0
-        total_bfs_nodes = 0
-        total_astar_time = 0
-        total_bfs_time = 0
+        level_numbers = [1, 2, 3]
+        
+        # Resolver todos los pares (nivel, algoritmo) en paralelo
+        results = self._solve_levels_batch(level_numbers, ['astar', 'bfs', 'idastar'])
         
         results_summary = []
         
-        for level_num in [1, 2, 3]:
+        for level_num in level_numbers:
             level = get_level(level_num)
-            robot_x, robot_y = level['robot_start']
-            
-            game_state = GameState(level['grid'], robot_x, robot_y)
             
             print(f"\n--- {level['name']} ---")
             
-            # Resolver con A*
-            astar_solver = AStar(game_state)
-            astar_result = astar_solver.solve()
-            
-            # Resolver con BFS
-            bfs_solver = BFS(game_state)
-            bfs_result = bfs_solver.solve()
-            
-            # Acumular estadísticas
-            total_astar_nodes += astar_result['nodes_explored']
-            total_bfs_nodes += bfs_result['nodes_explored']
-            total_astar_time += astar_result['execution_time']
-            total_bfs_time += bfs_result['execution_time']
+            astar_result = results[(level_num, 'astar')]
+            bfs_result = results[(level_num, 'bfs')]
+            idastar_result = results[(level_num, 'idastar')]
             
             # Guardar resultados para README
             results_summary.append({
                 'level': level_num,
                 'level_name': level['name'],
                 'astar': astar_result,
-                'bfs': bfs_result
+                'bfs': bfs_result,
+                'idastar': idastar_result
             })
             
             # Mostrar resultados del nivel
-            print(f"A*:  {astar_result['nodes_explored']:3d} nodos, {astar_result['steps']:2d} pasos, {astar_result['execution_time']:6.2f}ms")
-            print(f"BFS: {bfs_result['nodes_explored']:3d} nodos, {bfs_result['steps']:2d} pasos, {bfs_result['execution_time']:6.2f}ms")
+            print(f"A*:  {astar_result['nodes_explored']:3d} nodos, {astar_result['steps']:2d} pasos, {self.renderer.format_time(astar_result, '6.2f')}")
+            print(f"BFS: {bfs_result['nodes_explored']:3d} nodos, {bfs_result['steps']:2d} pasos, {self.renderer.format_time(bfs_result, '6.2f')}")
+            print(f"IDA*: {idastar_result['nodes_explored']:3d} nodos, {idastar_result['steps']:2d} pasos, {self.renderer.format_time(idastar_result, '6.2f')}")
+            thresholds = ', '.join(f"f<={it['threshold']}: {it['nodes_explored']}" for it in idastar_result['iterations'])
+            print(f"      iteraciones ({len(idastar_result['iterations'])}): {thresholds}")
+        
+        # Acumular estadísticas
+        totals = aggregate(
+            {'level': level_num, 'algorithm': algorithm, 'result': result}
+            for (level_num, algorithm), result in results.items()
+        )
+        total_astar_nodes = totals['astar']['nodes_explored']
+        total_bfs_nodes = totals['bfs']['nodes_explored']
+        total_astar_time = totals['astar']['execution_time']
+        total_bfs_time = totals['bfs']['execution_time']
         
         # Mostrar resumen total
         print("\n" + "=" * 60)
         print("RESUMEN TOTAL:")
-        print(f"A*:  {total_astar_nodes:3d} nodos totales, {total_astar_time:6.2f}ms totales")
-        print(f"BFS: {total_bfs_nodes:3d} nodos totales, {total_bfs_time:6.2f}ms totales")
+        print(f"A*:  {total_astar_nodes:3d} nodos totales, {self._format_total_time(totals['astar'])}")
+        print(f"BFS: {total_bfs_nodes:3d} nodos totales, {self._format_total_time(totals['bfs'])}")
+        print(f"IDA*: {totals['idastar']['nodes_explored']:3d} nodos totales, {self._format_total_time(totals['idastar'])}")
         
         efficiency_nodes = ((total_bfs_nodes - total_astar_nodes) / total_bfs_nodes) * 100
-        efficiency_time = ((total_bfs_time - total_astar_time) / total_bfs_time) * 100
-        
         print(f"\nA* fue {efficiency_nodes:.1f}% más eficiente en nodos explorados")
-        print(f"A* fue {efficiency_time:.1f}% más rápido en tiempo de ejecución")
+        
+        # Solo se comparan tiempos medidos en esta ejecución y sin competir por la CPU
+        if totals['astar']['cached'] or totals['bfs']['cached']:
+            print("Tiempos no comparables: hay resultados de la caché")
+        elif any(result.get('parallel') for result in results.values()):
+            print("Tiempos no comparables: los algoritmos se ejecutaron en paralelo")
+        else:
+            efficiency_time = ((total_bfs_time - total_astar_time) / total_bfs_time) * 100
+            print(f"A* fue {efficiency_time:.1f}% más rápido en tiempo de ejecución")
         
         # Guardar resultados para uso posterior
         self.last_comparison_results = results_summary
 
+    def _format_total_time(self, total):
+        """Tiempo total de un algoritmo, indicando cuántos resultados vinieron de la caché"""
+        if total['cached'] == total['jobs']:
+            return "tiempos en caché"
+        text = f"{total['execution_time']:6.2f}ms totales"
+        if total['cached']:
+            text += f" ({total['cached']} en caché, sin tiempo)"
+        return text
+
+    def _solve_levels_batch(self, level_numbers, algorithms):
+        """
+        Resuelve cada par (nivel, algoritmo): primero consulta la caché y los
+        que falten se reparten en paralelo con BatchSolver. Los resueltos en
+        el pool se marcan con 'parallel' (sus tiempos se midieron compitiendo
+        por la CPU); si el pool falla, los que faltan se resuelven aquí mismo.
+        Retorna {(nivel, algoritmo): resultado}
+        """
+        results = {}
+        pending = []
+        
+        for level_num in level_numbers:
+            level = get_level(level_num)
+            for algorithm in algorithms:
+                cached = self.solution_cache.get(level['grid'], level['robot_start'], algorithm)
+                if cached is not None:
+                    results[(level_num, algorithm)] = cached
+                else:
+                    pending.append((level_num, algorithm))
+        
+        if pending:
+            levels = {level_num: get_level(level_num) for level_num in level_numbers}
+            try:
+                with BatchSolver(levels, max_workers=min(len(pending), os.cpu_count() or 1)) as batch:
+                    for job in batch.run(pending):
+                        if job['result'] is None:
+                            print(f"⚠️  Error en el pool con el nivel {job['level']} ({job['algorithm']}): {job['error']}")
+                            continue
+                        job['result']['parallel'] = True
+                        results[(job['level'], job['algorithm'])] = job['result']
+            except Exception as e:
+                # Un pool que no arranca o se rompe no debe cerrar el juego
+                print(f"⚠️  No se pudo resolver en paralelo ({e}); resolviendo en este proceso...")
+            
+            for level_num, algorithm in pending:
+                if (level_num, algorithm) not in results:
+                    level = levels[level_num]
+                    game_state = GameState(level['grid'], *level['robot_start'])
+                    results[(level_num, algorithm)] = solve_job(game_state, algorithm)
+                level = levels[level_num]
+                self.solution_cache.put(level['grid'], level['robot_start'], algorithm, results[(level_num, algorithm)])
+        
+        return results
+
     def _generate_readme(self):
         """Genera el archivo README.txt con los resultados"""
         print("\n📝 GENERANDO README.txt...")
@@ -269,39 +353,44 @@ class LightBotGame:
                 f.write("Esta heurística es optimista porque:\n")
                 f.write("- Nunca sobreestima el costo real\n")
                 f.write("- Considera el mínimo de acciones necesarias\n")
-                f.write("- Usa distancia Manhattan (admisible)\n\n")
+                f.write("- Usa la distancia real sobre el tablero, evitando obstáculos (admisible)\n\n")
                 
                 f.write("## Resultados de Comparación\n\n")
                 
-                total_astar_nodes = 0
-                total_bfs_nodes = 0
-                total_astar_time = 0
-                total_bfs_time = 0
-                
                 for result in self.last_comparison_results:
                     f.write(f"### {result['level_name']}\n")
                     f.write(f"- A*: {result['astar']['nodes_explored']} nodos, ")
                     f.write(f"{result['astar']['steps']} pasos, ")
-                    f.write(f"{result['astar']['execution_time']:.2f}ms\n")
+                    f.write(f"{self.renderer.format_time(result['astar'])}\n")
                     f.write(f"- BFS: {result['bfs']['nodes_explored']} nodos, ")
                     f.write(f"{result['bfs']['steps']} pasos, ")
-                    f.write(f"{result['bfs']['execution_time']:.2f}ms\n\n")
-                    
-                    total_astar_nodes += result['astar']['nodes_explored']
-                    total_bfs_nodes += result['bfs']['nodes_explored']
-                    total_astar_time += result['astar']['execution_time']
-                    total_bfs_time += result['bfs']['execution_time']
+                    f.write(f"{self.renderer.format_time(result['bfs'])}\n\n")
+                
+                totals = aggregate(
+                    {'algorithm': algorithm, 'result': result[algorithm]}
+                    for result in self.last_comparison_results
+                    for algorithm in ('astar', 'bfs')
+                )
+                total_astar_nodes = totals['astar']['nodes_explored']
+                total_bfs_nodes = totals['bfs']['nodes_explored']
                 
                 f.write("## Resumen Total\n\n")
-                f.write(f"- A*: {total_astar_nodes} nodos totales, {total_astar_time:.2f}ms totales\n")
-                f.write(f"- BFS: {total_bfs_nodes} nodos totales, {total_bfs_time:.2f}ms totales\n\n")
+                f.write(f"- A*: {total_astar_nodes} nodos totales, {self._format_total_time(totals['astar'])}\n")
+                f.write(f"- BFS: {total_bfs_nodes} nodos totales, {self._format_total_time(totals['bfs'])}\n\n")
                 
                 efficiency_nodes = ((total_bfs_nodes - total_astar_nodes) / total_bfs_nodes) * 100
-                efficiency_time = ((total_bfs_time - total_astar_time) / total_bfs_time) * 100
                 
                 f.write("## Análisis de Eficiencia\n\n")
                 f.write(f"- A* exploró {efficiency_nodes:.1f}% menos nodos que BFS\n")
-                f.write(f"- A* fue {efficiency_time:.1f}% más rápido que BFS\n\n")
+                if totals['astar']['cached'] or totals['bfs']['cached']:
+                    f.write("- Tiempos no comparables: hay resultados de la caché\n\n")
+                elif any(result[algorithm].get('parallel') for result in self.last_comparison_results
+                         for algorithm in ('astar', 'bfs')):
+                    f.write("- Tiempos no comparables: los algoritmos se ejecutaron en paralelo\n\n")
+                else:
+                    efficiency_time = ((totals['bfs']['execution_time'] - totals['astar']['execution_time'])
+                                       / totals['bfs']['execution_time']) * 100
+                    f.write(f"- A* fue {efficiency_time:.1f}% más rápido que BFS\n\n")
                 
                 f.write("## Conclusiones\n\n")
                 f.write("Los resultados demuestran que A* es más eficiente que BFS\n")
@@ -355,7 +444,7 @@ class LightBotGame:
                 
                 # Comparar con solución óptima
                 astar_solver = AStar(self.game_state)
-                optimal_result = astar_solver.solve()
+                optimal_result = self._solve_cached(self.game_state, 'astar', astar_solver.solve, path_only=True)
                 if optimal_result['success']:
                     print(f"Solución óptima: {optimal_result['steps']} pasos")
                     if len(user_path) == optimal_result['steps']:
@@ -387,10 +476,10 @@ class LightBotGame:
     def _render_current_state(self, level, node):
         """Renderiza el estado actual del juego"""
         print("\n" + "-" * 30)
-        self.renderer.render_level(level, node.x, node.y, list(node.lights))
+        self.renderer.render_level(level, node.x, node.y, self.game_state.get_light_states(node.mask))
         
-        lights_on = sum(node.lights)
-        total_lights = len(node.lights)
+        lights_on = node.mask.bit_count()
+        total_lights = self.game_state.num_lights
         print(f"Luces encendidas: {lights_on}/{total_lights}")
 
     def _execute_command(self, current_node, command):
@@ -410,23 +499,19 @@ class LightBotGame:
             
             if self.game_state.can_move_to(new_x, new_y):
                 from node import Node
-                return Node(new_x, new_y, list(current_node.lights), 
+                return Node(new_x, new_y, current_node.mask,
+                          self.game_state.pack_state(new_x, new_y, current_node.mask),
                           current_node, command, current_node.cost + 1)
         
         # Verificar encender luz
         elif command == 'ENCENDER':
-            if self.game_state.can_turn_on_light(current_node.x, current_node.y, current_node.lights):
-                light_index = None
-                for i, (lx, ly) in enumerate(self.game_state.light_positions):
-                    if lx == current_node.x and ly == current_node.y:
-                        light_index = i
-                        break
-                
-                new_lights = list(current_node.lights)
-                new_lights[light_index] = 1
+            if self.game_state.can_turn_on_light(current_node.x, current_node.y, current_node.mask):
+                light_index = self.game_state.get_light_index(current_node.x, current_node.y)
+                new_mask = current_node.mask | (1 << light_index)
                 
                 from node import Node
-                return Node(current_node.x, current_node.y, new_lights,
+                return Node(current_node.x, current_node.y, new_mask,
+                          current_node.state | (1 << light_index),
                           current_node, command, current_node.cost + 1)
         
         return None
@@ -434,15 +519,17 @@ class LightBotGame:
     def _show_optimal_solution(self):
         """Muestra la solución óptima usando A*"""
         astar_solver = AStar(self.game_state)
-        result = astar_solver.solve()
+        result = self._solve_cached(self.game_state, 'astar', astar_solver.solve, path_only=True)
         
         if result['success']:
             print("\n💡 SOLUCIÓN ÓPTIMA (A*):")
             self.renderer.show_solution(result['path'], "A*")
-            print(f"Nodos explorados: {result['nodes_explored']}")
-            print(f"Tiempo: {result['execution_time']:.2f}ms")
+            if 'nodes_explored' in result:
+                print(f"Nodos explorados: {result['nodes_explored']}")
+            print(f"Tiempo: {self.renderer.format_time(result)}")
         else:
             print("❌ No se encontró solución.")
+            self.renderer.show_unreachable_lights(result)
 
 def main():
     """Función principal"""
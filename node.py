@@ -3,10 +3,14 @@ Clase que representa un nodo en el espacio de estados del juego LightBot
 """
 
 class Node:
-    def __init__(self, x, y, lights, parent=None, action=None, cost=0):
+    __slots__ = ('x', 'y', 'mask', 'state', 'parent', 'action', 'cost',
+                 'heuristic', 'total_cost', 'visited_order')
+
+    def __init__(self, x, y, mask, state, parent=None, action=None, cost=0):
         self.x = x                    # Posición X del robot
         self.y = y                    # Posición Y del robot
-        self.lights = tuple(lights)   # Tupla con estado de las luces (0=apagada, 1=encendida)
+        self.mask = mask              # Máscara de bits con el estado de las luces (bit i = luz i encendida)
+        self.state = state            # Estado empaquetado: índice de celda + máscara en un solo entero
         self.parent = parent          # Nodo padre para reconstruir el camino
         self.action = action          # Acción que llevó a este estado
         self.cost = cost              # Costo acumulado (g en A*)
@@ -15,36 +19,24 @@ class Node:
         self.visited_order = -1       # Orden en que fue visitado
 
     def get_key(self):
-        """Genera una clave única para este estado"""
-        return f"{self.x},{self.y},{','.join(map(str, self.lights))}"
+        """Genera una clave única para este estado (el entero empaquetado)"""
+        return self.state
 
     def equals(self, other):
         """Verifica si dos nodos representan el mismo estado"""
-        return (self.x == other.x and 
-                self.y == other.y and 
-                self.lights == other.lights)
-
-    def copy(self, new_x=None, new_y=None, new_lights=None):
-        """Crea una copia del nodo con nuevos valores"""
-        if new_x is None:
-            new_x = self.x
-        if new_y is None:
-            new_y = self.y
-        if new_lights is None:
-            new_lights = list(self.lights)
-        
-        return Node(new_x, new_y, new_lights, self.parent, self.action, self.cost)
+        return self.state == other.state
 
     def get_path(self):
         """Reconstruye el camino desde el nodo inicial hasta este nodo"""
         path = []
         current = self
-        
+
         while current.parent is not None:
-            path.insert(0, current.action)
+            path.append(current.action)
             current = current.parent
-        
+
+        path.reverse()
         return path
 
     def __str__(self):
-        return f"Node(x={self.x}, y={self.y}, lights={self.lights}, cost={self.cost})"
\ No newline at end of file
+        return f"Node(x={self.x}, y={self.y}, mask={self.mask:b}, cost={self.cost})"
\ No newline at end of file
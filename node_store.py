@@ -0,0 +1,91 @@
+"""
+Almacén compacto de nodos para los algoritmos de búsqueda.
+
+Cada nodo es una fila en columnas paralelas de tipo array (estado,
+índice del padre, código de acción, g, h) en lugar de un objeto Node
+con puntero al padre.
+"""
+from array import array
+from node import Node
+from game_state import ACTIONS
+
+NO_PARENT = -1
+
+class NodeStore:
+    def __init__(self):
+        self.states = array('q')      # Estado empaquetado
+        self.parents = array('i')     # Índice del nodo padre (-1 en la raíz)
+        self.actions = array('b')     # Código de la acción que llevó a este nodo
+        self.costs = array('i')       # Costo acumulado (g)
+        self.heuristics = array('i')  # Valor heurístico (h)
+
+    def add(self, state, parent=NO_PARENT, action=-1, cost=0, heuristic=0):
+        """Agrega un nodo y retorna su índice"""
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.costs.append(cost)
+        self.heuristics.append(heuristic)
+        return len(self.states) - 1
+
+    def get_path(self, index):
+        """Reconstruye el camino recorriendo los índices de los padres"""
+        path = []
+        parents = self.parents
+        actions = self.actions
+
+        while parents[index] != NO_PARENT:
+            path.append(ACTIONS[actions[index]])
+            index = parents[index]
+
+        path.reverse()
+        return path
+
+    def get_reverse_path(self, index):
+        """
+        Camino desde este nodo hasta la raíz de una búsqueda hacia atrás,
+        donde el padre es el siguiente estado hacia la meta
+        """
+        path = []
+        parents = self.parents
+        actions = self.actions
+
+        while parents[index] != NO_PARENT:
+            path.append(ACTIONS[actions[index]])
+            index = parents[index]
+
+        return path
+
+    def make_node(self, index, game_state, visited_order=-1):
+        """Materializa un Node (sin padre) a partir de una fila del almacén"""
+        state = self.states[index]
+        x, y, mask = game_state.unpack_state(state)
+        action = self.actions[index]
+
+        node = Node(x, y, mask, state, None, ACTIONS[action] if action >= 0 else None, self.costs[index])
+        node.heuristic = self.heuristics[index]
+        node.total_cost = node.cost + node.heuristic
+        node.visited_order = visited_order
+        return node
+
+    def __len__(self):
+        return len(self.states)
+
+
+class NodeView:
+    """Secuencia perezosa de nodos visitados; los Node se crean solo al leerlos"""
+
+    def __init__(self, store, indices, game_state):
+        self.store = store
+        self.indices = indices
+        self.game_state = game_state
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        return self.store.make_node(self.indices[position], self.game_state, position + 1)
+
+    def __iter__(self):
+        for position in range(len(self.indices)):
+            yield self[position]
@@ -1,5 +1,9 @@
 """
-Implementación de una cola de prioridad usando un heap binario
+Implementaciones de cola de prioridad para A*
+
+- PriorityQueue: heap binario (heapq), válido para cualquier prioridad
+- BucketQueue: cola de cubetas (Dial) para prioridades enteras pequeñas
+  no negativas, con encolar/desencolar O(1)
 """
 import heapq
 
@@ -9,10 +13,13 @@ class PriorityQueue:
         self.compare = compare_fn or (lambda a, b: a - b)
         self.counter = 0  # Para evitar comparaciones entre objetos
 
-    def enqueue(self, item):
-        """Agrega un elemento a la cola"""
+    def enqueue(self, item, priority=None, depth=0):
+        """Agrega un elemento a la cola (por defecto con prioridad item.total_cost)"""
+        if priority is None:
+            priority = item.total_cost
+
         # Usamos el counter para evitar comparaciones entre nodos
-        heapq.heappush(self.items, (item.total_cost, self.counter, item))
+        heapq.heappush(self.items, (priority, self.counter, item))
         self.counter += 1
 
     def dequeue(self):
@@ -29,4 +36,82 @@ class PriorityQueue:
 
     def size(self):
         """Retorna el tamaño de la cola"""
-        return len(self.items)
\ No newline at end of file
+        return len(self.items)
+
+
+class BucketQueue:
+    """
+    Cola de cubetas indexada por prioridad (f). Dentro de cada cubeta los
+    elementos se agrupan por profundidad (g) y se prefiere la más profunda,
+    que en A* desempata hacia los nodos más cercanos a la meta.
+    """
+
+    def __init__(self):
+        self.buckets = []      # buckets[f][g] -> lista de elementos
+        self.deepest = []      # deepest[f] -> mayor g posiblemente no vacío
+        self.min_priority = 0  # Cota inferior de la menor cubeta no vacía
+        self.count = 0
+
+    def enqueue(self, item, priority=None, depth=0):
+        """Agrega un elemento con prioridad entera no negativa y profundidad g"""
+        if priority is None:
+            priority = item.total_cost
+
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+            self.deepest.append(-1)
+
+        bucket = self.buckets[priority]
+        while len(bucket) <= depth:
+            bucket.append([])
+        bucket[depth].append(item)
+
+        if depth > self.deepest[priority]:
+            self.deepest[priority] = depth
+        if priority < self.min_priority:
+            self.min_priority = priority
+        self.count += 1
+
+    def dequeue(self):
+        """Remueve y retorna el elemento de menor prioridad (y mayor profundidad)"""
+        if self.count == 0:
+            return None
+
+        # Avanzar hasta la primera cubeta no vacía
+        while self.deepest[self.min_priority] < 0:
+            self.min_priority += 1
+
+        priority = self.min_priority
+        bucket = self.buckets[priority]
+        depth = self.deepest[priority]
+        while not bucket[depth]:
+            depth -= 1
+
+        item = bucket[depth].pop()
+        self.count -= 1
+
+        # Retroceder el puntero de profundidad sobre las sub-cubetas vacías
+        while depth >= 0 and not bucket[depth]:
+            depth -= 1
+        self.deepest[priority] = depth
+        return item
+
+    def is_empty(self):
+        """Verifica si la cola está vacía"""
+        return self.count == 0
+
+    def size(self):
+        """Retorna el tamaño de la cola"""
+        return self.count
+
+
+QUEUES = {
+    'heap': PriorityQueue,
+    'bucket': BucketQueue
+}
+
+def get_queue_class(name='heap'):
+    """Retorna la clase de cola de prioridad por nombre ('heap' o 'bucket')"""
+    if name not in QUEUES:
+        raise ValueError(f"Cola de prioridad desconocida: {name}")
+    return QUEUES[name]
\ No newline at end of file
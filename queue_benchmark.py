@@ -0,0 +1,64 @@
+"""
+Benchmark de las colas de prioridad: heap binario vs cubetas (Dial)
+
+Uso:
+    python queue_benchmark.py [--items N] [--size LADO] [--lights N]
+"""
+import argparse
+import random
+import time
+from priority_queue import QUEUES
+from game_state import GameState
+from astar import AStar
+
+def benchmark_operations(items, max_priority, seed=0):
+    """Encola y desencola `items` elementos con prioridades enteras pequeñas"""
+    rng = random.Random(seed)
+    operations = [(rng.randrange(max_priority), rng.randrange(max_priority)) for _ in range(items)]
+    results = {}
+
+    for name, queue_class in QUEUES.items():
+        queue = queue_class()
+        start_time = time.perf_counter()
+        for index, (priority, depth) in enumerate(operations):
+            queue.enqueue(index, priority, depth)
+        while not queue.is_empty():
+            queue.dequeue()
+        results[name] = (time.perf_counter() - start_time) * 1000
+
+    return results
+
+def benchmark_solver(size, lights, seed=0):
+    """Resuelve con A* un tablero abierto de size x size con ambas colas"""
+    rng = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    cells = [(i, j) for i in range(size) for j in range(size) if (i, j) != (0, 0)]
+    for i, j in rng.sample(cells, lights):
+        grid[i][j] = 2
+
+    game_state = GameState(grid, 0, 0)
+    results = {}
+    for name in QUEUES:
+        result = AStar(game_state, queue=name).solve()
+        results[name] = result
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de colas de prioridad para A*")
+    parser.add_argument('--items', type=int, default=500000, help="Elementos a encolar en la prueba sintética")
+    parser.add_argument('--max-priority', type=int, default=64, help="Prioridad máxima (f) en la prueba sintética")
+    parser.add_argument('--size', type=int, default=20, help="Lado del tablero abierto para A*")
+    parser.add_argument('--lights', type=int, default=7, help="Número de luces del tablero para A*")
+    args = parser.parse_args()
+
+    print(f"=== Prueba sintética: {args.items} elementos, prioridades 0..{args.max_priority - 1} ===")
+    for name, elapsed in benchmark_operations(args.items, args.max_priority).items():
+        print(f"  {name:<7} {elapsed:10.2f}ms")
+
+    print(f"\n=== A* en tablero abierto {args.size}x{args.size} con {args.lights} luces ===")
+    for name, result in benchmark_solver(args.size, args.lights).items():
+        print(f"  {name:<7} {result['execution_time']:10.2f}ms  "
+              f"{result['nodes_explored']} nodos, frontera máx. {result['peak_frontier']}, {result['steps']} pasos")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Instrumentación opcional por fases de una búsqueda
+
+Con el perfil desactivado wrap() retorna la misma función, así que el bucle
+principal no paga nada. Activado, cada fase acumula llamadas y tiempo; el
+cronometraje agrega su propio costo al execution_time total.
+"""
+import time
+
+class SearchProfile:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = {}
+
+    def wrap(self, phase, function, count_items=False):
+        """
+        Retorna `function` cronometrada bajo el nombre `phase`.
+        count_items: además suma len() del resultado (p. ej. sucesores generados)
+        """
+        if not self.enabled:
+            return function
+
+        stats = self.phases.setdefault(phase, [0, 0.0, 0 if count_items else None])
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            value = function(*args, **kwargs)
+            stats[1] += perf_counter() - start
+            stats[0] += 1
+            if count_items:
+                stats[2] += len(value)
+            return value
+
+        return timed
+
+    def calls(self, phase):
+        """Número de llamadas registradas en una fase"""
+        stats = self.phases.get(phase)
+        return stats[0] if stats else 0
+
+    def items(self, phase):
+        """Elementos contados en una fase (solo con count_items)"""
+        stats = self.phases.get(phase)
+        return stats[2] or 0 if stats else 0
+
+    def result_fields(self, **counters):
+        """
+        Campo 'profile' para el diccionario de resultado: por fase, llamadas
+        y tiempo acumulado (ms); más los contadores indicados por el algoritmo
+        """
+        if not self.enabled:
+            return {'profile': None}
+
+        phases = {}
+        for phase, (calls, elapsed, items) in self.phases.items():
+            phases[phase] = {'calls': calls, 'time_ms': elapsed * 1000}
+            if items is not None:
+                phases[phase]['items'] = items
+        return {'profile': {'phases': phases, **counters}}
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Soporte para búsquedas por pasos: cronómetro con pausas y snapshots de progreso
+"""
+import time
+
+class SearchClock:
+    """Cronómetro que excluye el tiempo en que la búsqueda estuvo pausada"""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.running = True
+        self.resumed_at = time.perf_counter()
+
+    def pause(self):
+        """Detiene el conteo (antes de ceder el control con yield)"""
+        self.elapsed += time.perf_counter() - self.resumed_at
+        self.running = False
+
+    def resume(self):
+        """Reanuda el conteo (al volver de un yield)"""
+        self.resumed_at = time.perf_counter()
+        self.running = True
+
+    def elapsed_ms(self):
+        """Tiempo activo acumulado en milisegundos"""
+        elapsed = self.elapsed
+        if self.running:
+            elapsed += time.perf_counter() - self.resumed_at
+        return elapsed * 1000
+
+
+def make_snapshot(nodes_explored, frontier_size, best_f, elapsed_ms, result=None):
+    """
+    Snapshot de progreso producido por los generadores steps() de los algoritmos.
+    Solo el último snapshot tiene done=True y el diccionario de resultado.
+    """
+    return {
+        'done': result is not None,
+        'nodes_explored': nodes_explored,
+        'frontier_size': frontier_size,
+        'best_f': best_f,
+        'elapsed_ms': elapsed_ms,
+        'result': result
+    }
\ No newline at end of file
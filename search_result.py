@@ -0,0 +1,23 @@
+"""
+Diccionario de resultado común a todos los algoritmos
+"""
+
+def make_result(game_state, success, path, nodes_explored, execution_time, final_node=None,
+                visited_nodes=None, **fields):
+    """
+    Construye el resultado de una búsqueda: los campos que comparten todos
+    los algoritmos, incluidas las luces inalcanzables del nivel (ver
+    GameState.start_states), más los campos propios de cada algoritmo
+    """
+    result = {
+        'success': success,
+        'path': path,
+        'nodes_explored': nodes_explored,
+        'execution_time': execution_time,  # en ms
+        'steps': len(path),
+        'final_node': final_node,
+        'visited_nodes': [] if visited_nodes is None else visited_nodes,
+        'unreachable_lights': game_state.unreachable_lights
+    }
+    result.update(fields)
+    return result
\ No newline at end of file
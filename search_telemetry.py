@@ -0,0 +1,97 @@
+"""
+Telemetría en vivo de una búsqueda
+
+SearchTelemetry ejecuta la búsqueda por pasos (steps()) y llama a un sink
+cada `every_nodes` expansiones o cada `every_ms` milisegundos con un evento:
+nodos explorados, nodos por segundo, frontera, cota f actual y tiempo.
+El último evento tiene done=True. JsonLinesSink escribe cada evento como
+una línea JSON en un archivo o en la salida estándar.
+
+Uso:
+    with JsonLinesSink('telemetria.jsonl') as sink:
+        result = AStar(game_state, telemetry=SearchTelemetry(sink, every_ms=500)).solve()
+"""
+import json
+import sys
+
+# Cada cuántos nodos se revisa el reloj cuando solo hay intervalo de tiempo
+TIME_CHECK_BATCH = 100
+
+class SearchTelemetry:
+    def __init__(self, sink, every_nodes=None, every_ms=None, label=None):
+        """
+        sink: función que recibe cada evento (diccionario)
+        every_nodes / every_ms: frecuencia de los eventos (al menos una)
+        label: nombre opcional que se incluye en cada evento
+        """
+        if every_nodes is None and every_ms is None:
+            raise ValueError("Se requiere every_nodes o every_ms para la telemetría")
+        self.sink = sink
+        self.every_nodes = every_nodes
+        self.every_ms = every_ms
+        self.label = label
+
+    def run(self, steps):
+        """Consume el generador steps(batch_size) de un algoritmo emitiendo eventos; retorna el resultado"""
+        batch_size = self.every_nodes or TIME_CHECK_BATCH
+        if self.every_ms is not None:
+            batch_size = min(batch_size, TIME_CHECK_BATCH)
+
+        next_nodes = self.every_nodes
+        next_ms = self.every_ms
+
+        for snapshot in steps(batch_size):
+            if snapshot['done']:
+                self.sink(self._event(snapshot))
+                return snapshot['result']
+
+            due = next_nodes is not None and snapshot['nodes_explored'] >= next_nodes
+            due = due or (next_ms is not None and snapshot['elapsed_ms'] >= next_ms)
+            if due:
+                self.sink(self._event(snapshot))
+                if next_nodes is not None:
+                    next_nodes = snapshot['nodes_explored'] + self.every_nodes
+                if next_ms is not None:
+                    next_ms = snapshot['elapsed_ms'] + self.every_ms
+
+    def _event(self, snapshot):
+        """Convierte un snapshot de progreso en un evento de telemetría"""
+        elapsed_ms = snapshot['elapsed_ms']
+        event = {
+            'done': snapshot['done'],
+            'nodes_explored': snapshot['nodes_explored'],
+            'nodes_per_sec': snapshot['nodes_explored'] / (elapsed_ms / 1000) if elapsed_ms > 0 else 0.0,
+            'frontier_size': snapshot['frontier_size'],
+            'f_bound': snapshot['best_f'],
+            'elapsed_ms': elapsed_ms
+        }
+        if self.label is not None:
+            event['label'] = self.label
+        if snapshot['done']:
+            event['success'] = snapshot['result']['success']
+        return event
+
+
+class JsonLinesSink:
+    def __init__(self, target=None):
+        """target: ruta de archivo (se agrega al final), archivo abierto o None para stdout"""
+        self.owned = isinstance(target, str)
+        if self.owned:
+            self.stream = open(target, 'a', encoding='utf-8')
+        else:
+            self.stream = target or sys.stdout
+
+    def __call__(self, event):
+        self.stream.write(json.dumps(event) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        """Cierra el archivo si lo abrió el sink"""
+        if self.owned:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
\ No newline at end of file
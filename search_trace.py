@@ -0,0 +1,47 @@
+"""
+Registro opcional del recorrido de una búsqueda
+
+Modos:
+- 'none':  no se guarda nada (por defecto, para ejecuciones sin interfaz)
+- 'cells': orden de primera visita por celda (lo que usa el renderer)
+- 'full':  todos los nodos expandidos, en orden (mantiene vivo el almacén de nodos)
+"""
+from array import array
+from node_store import NodeView
+
+TRACE_MODES = ('none', 'cells', 'full')
+
+class SearchTrace:
+    def __init__(self, mode, game_state):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Modo de traza desconocido: {mode}")
+
+        self.mode = mode
+        self.game_state = game_state
+        self.shift = game_state.num_lights
+        self.visited_cells = array('i', [0]) * game_state.compiled.size if mode == 'cells' else None
+        self.visit_order = array('i') if mode == 'full' else None
+
+    @property
+    def enabled(self):
+        return self.mode != 'none'
+
+    def record(self, order, index, state):
+        """Registra la expansión número `order` (nodo `index` del almacén, estado `state`)"""
+        if self.visited_cells is not None:
+            cell = state >> self.shift
+            if not self.visited_cells[cell]:
+                self.visited_cells[cell] = order
+        else:
+            self.visit_order.append(index)
+
+    def result_fields(self, store):
+        """Campos del recorrido para el diccionario de resultado"""
+        visited_nodes = []
+        if self.visit_order is not None:
+            visited_nodes = NodeView(store, self.visit_order, self.game_state)
+
+        return {
+            'visited_nodes': visited_nodes,
+            'visited_cells': self.visited_cells
+        }
\ No newline at end of file
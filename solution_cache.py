@@ -0,0 +1,306 @@
+"""
+Caché persistente de soluciones, indexada por un hash canónico del nivel
+
+- Nivel en memoria: LRU con capacidad fija
+- Nivel en disco: archivo sqlite (opcional)
+
+El hash canónico normaliza rotaciones y reflexiones del tablero: las 8
+simetrías del cuadrado solo permutan las 4 direcciones de movimiento y no
+cambian ningún costo, así que un camino óptimo de una variante se traduce
+a un camino óptimo de cualquier otra. El camino se guarda en el marco
+canónico y se traduce al marco de cada consulta.
+
+El resto del resultado (nodos explorados, recorrido de celdas) depende de
+la orientación, porque los movimientos se expanden en un orden fijo: se
+guarda aparte por orientación y solo se entrega para esa misma orientación.
+Los tiempos no se guardan: un resultado cacheado tiene execution_time=None
+y cached=True, para no mostrar como actual una medición de otra sesión.
+
+Las claves incluyen una huella del código de los solucionadores
+(SOLVER_MODULES): al cambiar cualquiera de ellos las entradas anteriores
+dejan de usarse y se borran del disco al abrir la caché.
+
+Uso:
+    python solution_cache.py clear [--path lightbot_cache.sqlite]
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import sqlite3
+from collections import OrderedDict
+from game_state import ACTIONS
+from compiled_level import MOVES
+
+# Simetrías del tablero: (fila, columna, filas, columnas) -> (fila', columna')
+SYMMETRIES = (
+    lambda x, y, rows, cols: (x, y),                        # identidad
+    lambda x, y, rows, cols: (y, rows - 1 - x),             # rotación 90°
+    lambda x, y, rows, cols: (rows - 1 - x, cols - 1 - y),  # rotación 180°
+    lambda x, y, rows, cols: (cols - 1 - y, x),             # rotación 270°
+    lambda x, y, rows, cols: (x, cols - 1 - y),             # espejo horizontal
+    lambda x, y, rows, cols: (rows - 1 - x, y),             # espejo vertical
+    lambda x, y, rows, cols: (y, x),                        # transpuesta
+    lambda x, y, rows, cols: (cols - 1 - y, rows - 1 - x),  # antitranspuesta
+)
+
+# Campos del resultado que no se guardan (objetos vivos, dependientes del nivel o mediciones de tiempo)
+SKIPPED_FIELDS = ('visited_nodes', 'final_node', 'unreachable_lights', 'execution_time', 'profile', 'parallel')
+
+# Campos válidos para todas las simetrías del tablero
+SHARED_FIELDS = ('success', 'path', 'steps')
+
+# Versión del formato de las entradas (parte de la clave en disco)
+CACHE_VERSION = 2
+
+# Módulos cuyo código determina los resultados cacheados (ver solver_fingerprint)
+SOLVER_MODULES = (
+    'compiled_level', 'game_state', 'node', 'node_store', 'priority_queue', 'state_set', 'state_graph',
+    'search_trace', 'search_progress', 'search_profile', 'search_result',
+    'astar', 'bfs', 'idastar', 'held_karp', 'light_graph', 'layer_bfs',
+)
+
+_fingerprint = None
+
+
+def solver_fingerprint():
+    """Hash corto del código fuente de SOLVER_MODULES, calculado una vez por proceso"""
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        for name in SOLVER_MODULES:
+            spec = importlib.util.find_spec(name)
+            digest.update(name.encode('utf-8'))
+            with open(spec.origin, 'rb') as f:
+                digest.update(f.read())
+        _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+
+def _key_prefix():
+    """Prefijo de las claves vigentes: formato de las entradas y código de los solucionadores"""
+    return f"v{CACHE_VERSION}:{solver_fingerprint()}:"
+
+
+def _transformed_shape(symmetry, rows, cols):
+    """Dimensiones del tablero tras aplicar la simetría"""
+    x, y = symmetry(rows - 1, cols - 1, rows, cols)
+    corner_x, corner_y = symmetry(0, 0, rows, cols)
+    return abs(x - corner_x) + 1, abs(y - corner_y) + 1
+
+
+def _action_map(symmetry):
+    """Traduce cada acción a la acción equivalente en el tablero transformado"""
+    mapping = {ACTIONS[-1]: ACTIONS[-1]}
+    # La parte lineal de la simetría se obtiene con un tablero grande cualquiera
+    size = 8
+    origin = symmetry(3, 3, size, size)
+    for code, (dx, dy) in enumerate(MOVES):
+        moved = symmetry(3 + dx, 3 + dy, size, size)
+        delta = (moved[0] - origin[0], moved[1] - origin[1])
+        mapping[ACTIONS[code]] = ACTIONS[MOVES.index(delta)]
+    return mapping
+
+
+def canonical_form(grid, robot_start):
+    """
+    Retorna (clave canónica, simetría usada) para un tablero y posición inicial.
+    La clave es la menor codificación entre las 8 simetrías.
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    best = None
+
+    for symmetry in SYMMETRIES:
+        new_rows, new_cols = _transformed_shape(symmetry, rows, cols)
+        transformed = [[0] * new_cols for _ in range(new_rows)]
+        for i in range(rows):
+            for j in range(cols):
+                new_i, new_j = symmetry(i, j, rows, cols)
+                transformed[new_i][new_j] = grid[i][j]
+
+        start = symmetry(robot_start[0], robot_start[1], rows, cols)
+        encoding = f"{new_rows}x{new_cols}|{start[0]},{start[1]}|" + '/'.join(
+            ''.join(str(cell) for cell in row) for row in transformed)
+        if best is None or encoding < best[0]:
+            best = (encoding, symmetry)
+
+    encoding, symmetry = best
+    return hashlib.sha256(encoding.encode('utf-8')).hexdigest(), symmetry
+
+
+class SolutionCache:
+    def __init__(self, path=None, capacity=256):
+        """
+        path: archivo sqlite para el nivel en disco (None = solo memoria)
+        capacity: máximo de entradas del LRU en memoria
+        """
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+
+        if path is not None:
+            try:
+                self.connection = sqlite3.connect(path)
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+                # Descartar entradas de otro formato o de otra versión de los solucionadores
+                self.connection.execute("DELETE FROM solutions WHERE substr(key, 1, ?) != ?",
+                                        (len(_key_prefix()), _key_prefix()))
+                self.connection.commit()
+            except sqlite3.Error:
+                # Sin disco disponible la caché sigue funcionando en memoria
+                self.connection = None
+
+    def get_or_solve(self, game_state, algorithm, solve_fn, path_only=False):
+        """
+        Retorna el resultado cacheado para el nivel de `game_state` y el
+        algoritmo indicado, o ejecuta `solve_fn()` y lo guarda.
+        `algorithm` debe identificar también las opciones del algoritmo.
+        Con path_only=True (quien solo usa success, path y steps) acepta el
+        camino guardado para otra simetría del tablero (ver get).
+        """
+        grid = game_state.level
+        robot_start = (game_state.robot_x, game_state.robot_y)
+        cached = self.get(grid, robot_start, algorithm, path_only)
+        if cached is not None:
+            return self._complete(cached, game_state)
+
+        result = solve_fn()
+        self.put(grid, robot_start, algorithm, result)
+        return result
+
+    def get(self, grid, robot_start, algorithm, path_only=False):
+        """
+        Busca un resultado completo guardado para esta misma orientación del
+        tablero, o None. Con path_only=True acepta cualquier simetría: si no
+        es la misma orientación solo entrega success, path y steps
+        (traducidos al marco consultado).
+        """
+        level_key, symmetry = canonical_form(grid, robot_start)
+        key = f"{_key_prefix()}{algorithm}:{level_key}"
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+        elif self.connection is not None:
+            row = self.connection.execute("SELECT data FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = json.loads(row[0])
+                self._remember(key, entry)
+
+        frame = str(SYMMETRIES.index(symmetry))
+        if entry is None or (not path_only and frame not in entry['frames']):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._from_canonical(entry, symmetry, frame if frame in entry['frames'] else None)
+
+    def put(self, grid, robot_start, algorithm, result):
+        """Guarda un resultado en ambos niveles de la caché"""
+        level_key, symmetry = canonical_form(grid, robot_start)
+        key = f"{_key_prefix()}{algorithm}:{level_key}"
+
+        # Conservar lo guardado para otras orientaciones del mismo tablero
+        entry = self.memory.get(key)
+        if entry is None and self.connection is not None:
+            row = self.connection.execute("SELECT data FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = json.loads(row[0])
+        entry = self._to_canonical(result, symmetry, entry)
+
+        self._remember(key, entry)
+        if self.connection is not None:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solutions (key, data) VALUES (?, ?)", (key, json.dumps(entry)))
+            self.connection.commit()
+
+    def clear(self):
+        """Vacía ambos niveles de la caché"""
+        self.memory.clear()
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM solutions")
+            self.connection.commit()
+
+    def close(self):
+        """Cierra el archivo de la caché en disco"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _remember(self, key, entry):
+        """Inserta en el LRU en memoria, descartando la entrada más antigua"""
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def _to_canonical(self, result, symmetry, entry=None):
+        """
+        Agrega un resultado a la entrada canónica (serializable): el camino
+        en el marco canónico y el resultado completo bajo su orientación
+        """
+        if entry is None:
+            actions = _action_map(symmetry)
+            entry = {field: result[field] for field in SHARED_FIELDS}
+            entry['path'] = [actions[action] for action in result['path']]
+            entry['frames'] = {}
+
+        details = {key: value for key, value in result.items() if key not in SKIPPED_FIELDS}
+        if details.get('visited_cells') is not None:
+            details['visited_cells'] = list(details['visited_cells'])
+        entry['frames'][str(SYMMETRIES.index(symmetry))] = details
+        return entry
+
+    def _from_canonical(self, entry, symmetry, frame=None):
+        """
+        Resultado completo guardado para la orientación `frame`, o solo los
+        campos compartidos traducidos al marco del tablero consultado
+        """
+        if frame is not None:
+            result = dict(entry['frames'][frame])
+        else:
+            result = {field: entry[field] for field in SHARED_FIELDS}
+            inverse = {value: key for key, value in _action_map(symmetry).items()}
+            result['path'] = [inverse[action] for action in entry['path']]
+
+        result['execution_time'] = None
+        result['cached'] = True
+        return result
+
+    def _complete(self, result, game_state):
+        """Reconstruye los campos vivos (nodo final) reproduciendo el camino"""
+        result.setdefault('visited_nodes', [])
+        result.setdefault('visited_cells', None)
+        result['final_node'] = None
+        result['unreachable_lights'] = game_state.unreachable_lights
+
+        if result['success']:
+            node = game_state.get_initial_node()
+            for action in result['path']:
+                node = next(successor for successor in game_state.get_successors(node)
+                            if successor.action == action)
+            node.heuristic = game_state.heuristic(node)
+            node.total_cost = node.cost + node.heuristic
+            result['final_node'] = node
+
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caché de soluciones LightBot")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    clear = subparsers.add_parser('clear', help="Vacía la caché en disco")
+    clear.add_argument('--path', default='lightbot_cache.sqlite', help="Archivo sqlite de la caché")
+    args = parser.parse_args()
+
+    cache = SolutionCache(args.path)
+    cache.clear()
+    cache.close()
+    print(f"Caché vaciada: {args.path}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Grafo de transiciones de estados precalculado por nivel (opcional)
+
+Enumera una sola vez todos los estados alcanzables desde cualquier celda
+caminable con las luces apagadas (así sirve para cualquier celda de
+inicio) y guarda los sucesores de cada uno. Los algoritmos lo usan a
+través de GameState.precompile_graph(), que reemplaza expand() por una
+consulta a la tabla: generar sucesores deja de costar después de la
+primera pasada.
+
+El grafo se guarda en columnas planas de array en formato CSR (filas
+comprimidas), unos 60 bytes por estado: los estados, los desplazamientos
+de cada fila y los sucesores y códigos de acción de todas las filas
+seguidos. La fila de un estado se busca en un índice denso (una posición
+por estado posible) si el espacio de estados no es mucho mayor que el
+grafo, o por bisección sobre las filas ordenadas por estado si lo es.
+
+to_csr() exporta el grafo con los sucesores como índices en states, con
+arreglos de NumPy si está instalado, o de array si no, para motores
+vectorizados.
+"""
+import time
+from array import array
+from bisect import bisect_left
+from state_set import make_visited_set
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Número máximo de estados a enumerar
+MAX_GRAPH_STATES = 2_000_000
+
+# Si celdas caminables x 2^luces supera max_states por este factor, ni se intenta enumerar
+ESTIMATE_MARGIN = 4
+
+# Índice denso si el espacio de estados no supera este factor por el número de estados
+DENSE_INDEX_FACTOR = 4
+
+# Cada cuántos estados se revisa el tiempo límite (máscara de bits: 4096 - 1)
+DEADLINE_CHECK_MASK = 4095
+
+class StateGraph:
+    def __init__(self, game_state, max_states=MAX_GRAPH_STATES, time_limit=None):
+        """
+        max_states: si el grafo tiene más estados se lanza ValueError
+        time_limit: segundos máximos de enumeración (None = sin límite);
+        al vencer se lanza TimeoutError
+        """
+        self.game_state = game_state
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        # Semillas: cada celda caminable con la máscara inicial
+        shift = game_state.num_lights
+        queue = array('q', [
+            (cell << shift) | game_state.initial_mask
+            for cell in range(game_state.compiled.size)
+            if game_state.compiled.is_walkable(cell)
+        ])
+        if len(queue) << shift > ESTIMATE_MARGIN * max_states:
+            raise ValueError(f"Grafo de estados demasiado grande: hasta {len(queue) << shift} estados "
+                             f"(límite {max_states})")
+
+        visited = make_visited_set(game_state)
+        for state in queue:
+            visited[state] = 1
+
+        # Recorrido en anchura del espacio de estados (el arreglo crece mientras se recorre)
+        expand = game_state.expand
+        offsets = array('q', [0])
+        targets = array('q')
+        actions = array('b')
+        for position, state in enumerate(queue):
+            if deadline is not None and not position & DEADLINE_CHECK_MASK and time.perf_counter() > deadline:
+                raise TimeoutError(f"Grafo de estados sin terminar tras {time_limit}s ({position} estados)")
+            for successor_state, code in expand(state):
+                targets.append(successor_state)
+                actions.append(code)
+                if not visited[successor_state]:
+                    if len(queue) >= max_states:
+                        raise ValueError(f"Grafo de estados demasiado grande: más de {max_states} estados")
+                    visited[successor_state] = 1
+                    queue.append(successor_state)
+            offsets.append(len(targets))
+        del visited
+
+        # Índice de filas: denso si el espacio de estados es poco mayor que el grafo
+        state_space = game_state.compiled.size << shift
+        if state_space <= DENSE_INDEX_FACTOR * len(queue):
+            self.index = array('i', [-1]) * state_space
+            for position, state in enumerate(queue):
+                self.index[state] = position
+            self.states, self.offsets, self.targets, self.actions = queue, offsets, targets, actions
+            self.successors = self._successors_dense
+        else:
+            # Reordenar las filas por estado para buscarlas por bisección
+            self.index = None
+            self.states = array('q')
+            self.offsets = array('q', [0])
+            self.targets = array('q')
+            self.actions = array('b')
+            for position in sorted(range(len(queue)), key=queue.__getitem__):
+                start, end = offsets[position], offsets[position + 1]
+                self.states.append(queue[position])
+                self.targets.extend(targets[start:end])
+                self.actions.extend(actions[start:end])
+                self.offsets.append(len(self.targets))
+            self.successors = self._successors_sorted
+
+    def __len__(self):
+        return len(self.states)
+
+    def _position(self, state):
+        """Fila de un estado empaquetado en las columnas del grafo"""
+        if self.index is not None:
+            position = self.index[state]
+            if position < 0:
+                raise KeyError(state)
+        else:
+            position = bisect_left(self.states, state)
+            if position == len(self.states) or self.states[position] != state:
+                raise KeyError(state)
+        return position
+
+    def _successors_dense(self, state):
+        """Pares (estado sucesor, código de acción) de un estado empaquetado, como expand()"""
+        position = self.index[state]
+        if position < 0:
+            raise KeyError(state)
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return zip(self.targets[start:end], self.actions[start:end])
+
+    def _successors_sorted(self, state):
+        """successors() por bisección sobre las filas ordenadas por estado"""
+        position = self._position(state)
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return zip(self.targets[start:end], self.actions[start:end])
+
+    def edge_count(self):
+        """Número total de transiciones del grafo"""
+        return len(self.targets)
+
+    def to_csr(self):
+        """
+        Retorna (states, offsets, targets, actions): los sucesores del estado
+        states[i] son targets[offsets[i]:offsets[i + 1]] (índices en states)
+        con los códigos de acción actions[offsets[i]:offsets[i + 1]]
+        """
+        targets = array('q', (self._position(state) for state in self.targets))
+        columns = (self.states, self.offsets, targets, self.actions)
+        if np is not None:
+            return tuple(np.frombuffer(column, dtype=column.typecode) for column in columns)
+        return columns
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Conjuntos densos de estados visitados
+
+El espacio de estados está acotado por celdas x 2^luces, así que un estado
+empaquetado sirve directamente como índice: el conjunto es un bytearray
+preasignado con un byte por estado posible y la pertenencia es una sola
+operación de índice (visited[state]). Si el espacio es demasiado grande
+para reservarlo, se usa un diccionario disperso con la misma interfaz.
+"""
+
+# Tamaño máximo del arreglo denso (un byte por estado posible)
+MAX_DENSE_STATES = 64 * 1024 * 1024
+
+class SparseStateSet(dict):
+    """Respaldo disperso: visited[state] vale 0 para los estados ausentes (sin insertarlos)"""
+
+    def __missing__(self, key):
+        return 0
+
+def make_visited_set(game_state, max_states=MAX_DENSE_STATES):
+    """Conjunto de estados visitados para el nivel, denso si el espacio cabe en max_states"""
+    state_space = game_state.compiled.size << game_state.num_lights
+    if state_space <= max_states:
+        return bytearray(state_space)
+    return SparseStateSet()
\ No newline at end of file